@@ -0,0 +1,238 @@
+import os
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
+
+from experiments.base.grid_runner import FunctionTriple
+from experiments.base.parallel import payload_executor, worker_payload
+
+# Поиск всех бассейнов притяжения многоэкстремальной функции мультистартом.
+#
+# Начальные точки берутся из квазислучайной последовательности (Sobol или
+# латинский гиперкуб) в прямоугольнике bounds. Запуски выполняются волнами в
+# пуле процессов; между волнами найденные минимумы объединяются (точки ближе
+# radius друг к другу считаются одним минимумом, поиск соседей — cKDTree).
+# Как в MLSL, запуск следующей волны не выполняется, если его начальная точка
+# уже лежит в радиусе известного минимума, и прерывается через callback, как
+# только траектория входит в такой радиус: бассейн засчитывается без
+# дорогого доведения до сходимости.
+#
+# Оптимизатор, функции и гиперпараметры передаются рабочим процессам один раз
+# (experiments.base.parallel.payload_executor); lambda и замыкания допустимы
+# там, где доступен fork, иначе запуски выполняются в одном процессе.
+
+SAMPLERS = ("sobol", "lhs", "uniform")
+
+
+@dataclass
+class BasinDiscoveryResult:
+    """
+    Результат поиска бассейнов.
+
+    Атрибуты:
+        minima: таблица найденных минимумов (x, f, hits — число запусков,
+            попавших в бассейн, first_run — номер запуска, нашедшего минимум),
+            упорядочена по f.
+        runs: по строке на запуск: начальная и конечная точки, номер
+            бассейна (-1 — запуск не сошёлся), признаки skipped/aborted и
+            число вызовов функции, градиента и гессиана.
+        wall_time: время работы в секундах.
+    """
+    minima: pd.DataFrame
+    runs: pd.DataFrame
+    wall_time: float
+
+    @property
+    def total_cost(self) -> Dict[str, int]:
+        """Суммарное число вызовов функции, градиента и гессиана по всем запускам."""
+        return {column: int(self.runs[column].sum())
+                for column in ("function_call_count", "gradient_call_count", "hessian_call_count")}
+
+
+def sample_starts(n_starts: int, bounds: Sequence[Tuple[float, float]], sampler: str = "sobol",
+                  seed: int = 0) -> np.ndarray:
+    """
+    Начальные точки в прямоугольнике bounds = [(low_1, high_1), ..., (low_d, high_d)].
+
+    'sobol' и 'lhs' — квазислучайные выборки scipy.stats.qmc (равномернее
+    покрывают область, чем независимые точки), 'uniform' — псевдослучайные.
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    d = len(bounds)
+    if sampler == "sobol":
+        engine = qmc.Sobol(d, seed=seed)
+    elif sampler == "lhs":
+        engine = qmc.LatinHypercube(d, seed=seed)
+    elif sampler == "uniform":
+        return np.random.default_rng(seed).uniform(bounds[:, 0], bounds[:, 1], size=(n_starts, d))
+    else:
+        raise ValueError(f"Unknown sampler: {sampler}. Expected one of {SAMPLERS}")
+    with warnings.catch_warnings():
+        # Sobol предупреждает, если n_starts — не степень двойки.
+        warnings.simplefilter("ignore", UserWarning)
+        unit = engine.random(n_starts)
+    return qmc.scale(unit, bounds[:, 0], bounds[:, 1])
+
+
+def _run_start(task: Tuple[int, np.ndarray, np.ndarray]) -> Dict[str, Any]:
+    """Один локальный запуск с прерыванием при входе в известный бассейн."""
+    run_id, x0, known = task
+    payload = worker_payload()
+    radius = payload["radius"]
+    tree = cKDTree(known) if len(known) else None
+
+    def nearest_basin(x: np.ndarray) -> int:
+        if tree is None:
+            return -1
+        distance, index = tree.query(x, distance_upper_bound=radius)
+        return int(index) if np.isfinite(distance) else -1
+
+    row: Dict[str, Any] = {"run": run_id, "x0": x0, "skipped": False, "aborted": False,
+                           "function_call_count": 0, "gradient_call_count": 0, "hessian_call_count": 0}
+    basin = nearest_basin(x0)
+    if basin >= 0:
+        row.update(x=x0, f=np.nan, known_basin=basin, skipped=True, converged=False)
+        return row
+
+    entered: List[int] = []
+
+    def callback(k: int, x: np.ndarray, fx: float) -> bool:
+        hit = nearest_basin(x)
+        if hit >= 0:
+            entered.append(hit)
+            return True
+        return False
+
+    f, grad, hess = payload["function"]
+    optimizer = payload["optimizer_class"](f, x0.copy(), grad=grad, hess=hess, callback=callback,
+                                           history_stride=0, **payload["hyperparams"])
+    result = optimizer.run()
+    row.update(x=np.asarray(result.x, dtype=float),
+               f=float(np.asarray(result.history["f"])[-1]),
+               known_basin=entered[0] if entered else -1,
+               aborted=bool(entered),
+               function_call_count=result.function_call_count,
+               gradient_call_count=result.gradient_call_count,
+               hessian_call_count=result.hessian_call_count)
+    row["converged"] = not entered and bool(np.linalg.norm(optimizer.counted_gradient(result.x)) < optimizer.tol)
+    return row
+
+
+def _merge_minima(minima: List[Dict[str, Any]], rows: List[Dict[str, Any]], radius: float) -> None:
+    """
+    Распределяет завершившиеся запуски по бассейнам. Прерванные и пропущенные
+    запуски уже знают свой бассейн; сошедшиеся конечные точки сравниваются с
+    известными минимумами, а оставшиеся группируются между собой: начиная с
+    лучшей точки, все точки в радиусе radius образуют новый минимум.
+    """
+    fresh = []
+    for row in rows:
+        if row["known_basin"] >= 0:
+            row["basin"] = row["known_basin"]
+            minima[row["basin"]]["hits"] += 1
+        elif row["converged"]:
+            fresh.append(row)
+        else:
+            row["basin"] = -1
+
+    if minima and fresh:
+        tree = cKDTree(np.array([m["x"] for m in minima]))
+        distance, index = tree.query(np.array([row["x"] for row in fresh]), distance_upper_bound=radius)
+        unmatched = []
+        for row, dist, i in zip(fresh, distance, index):
+            if np.isfinite(dist):
+                row["basin"] = int(i)
+                minima[i]["hits"] += 1
+                if row["f"] < minima[i]["f"]:
+                    minima[i]["x"], minima[i]["f"] = row["x"], row["f"]
+            else:
+                unmatched.append(row)
+        fresh = unmatched
+
+    if fresh:
+        fresh.sort(key=lambda row: row["f"])
+        points = np.array([row["x"] for row in fresh])
+        neighbours = cKDTree(points).query_ball_point(points, radius)
+        assigned = np.zeros(len(fresh), dtype=bool)
+        for i, row in enumerate(fresh):
+            if assigned[i]:
+                continue
+            members = [j for j in neighbours[i] if not assigned[j]]
+            assigned[members] = True
+            basin = len(minima)
+            minima.append({"x": row["x"], "f": row["f"], "hits": len(members),
+                           "first_run": min(fresh[j]["run"] for j in members)})
+            for j in members:
+                fresh[j]["basin"] = basin
+
+
+def discover_basins(optimizer_class: type,
+                    function: FunctionTriple,
+                    bounds: Sequence[Tuple[float, float]],
+                    n_starts: int = 64,
+                    sampler: str = "sobol",
+                    radius: float = 0.1,
+                    hyperparams: Optional[Dict[str, Any]] = None,
+                    max_workers: Optional[int] = None,
+                    wave_size: Optional[int] = None,
+                    early_abort: bool = True,
+                    seed: int = 0,
+                    verbose: bool = True) -> BasinDiscoveryResult:
+    """
+    Находит минимумы функции мультистартом из квазислучайных точек.
+
+    Args:
+        optimizer_class: Любой наследник AbstractOptimizer; создаётся как
+            optimizer_class(f, x0, grad=grad, hess=hess, **hyperparams).
+        function: Кортеж (f, grad, hess); grad и hess могут быть None.
+        bounds: Границы области поиска по каждой координате.
+        n_starts: Число начальных точек.
+        sampler: 'sobol', 'lhs' или 'uniform' (см. sample_starts).
+        radius: Радиус бассейна: минимумы ближе radius считаются одним, запуск,
+            вошедший в радиус известного минимума, прерывается.
+        hyperparams: Гиперпараметры оптимизатора.
+        max_workers: Число процессов (по умолчанию os.cpu_count());
+            1 — выполнение в текущем процессе без пула.
+        wave_size: Число запусков в волне; известные минимумы обновляются
+            между волнами (по умолчанию 4 × max_workers).
+        early_abort: Прерывать ли запуски при входе в известный бассейн (MLSL).
+        seed: Зерно генератора начальных точек.
+        verbose: Печатать ли прогресс по волнам.
+
+    Returns:
+        BasinDiscoveryResult: таблица минимумов, таблица запусков и время работы.
+    """
+    start = time.perf_counter()
+    max_workers = max_workers or os.cpu_count() or 1
+    wave_size = wave_size or 4 * max_workers
+    starts = sample_starts(n_starts, bounds, sampler, seed)
+    dim = starts.shape[1]
+
+    payload = dict(optimizer_class=optimizer_class, function=function,
+                   hyperparams=dict(hyperparams or {}), radius=radius)
+    minima: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    with payload_executor(payload, max_workers) as executor:
+        for wave_start in range(0, n_starts, wave_size):
+            known = np.array([m["x"] for m in minima]) if early_abort and minima else np.empty((0, dim))
+            tasks = [(i, starts[i], known) for i in range(wave_start, min(wave_start + wave_size, n_starts))]
+            wave = list(executor.map(_run_start, tasks))
+            _merge_minima(minima, wave, radius)
+            rows.extend(wave)
+            if verbose:
+                print(f"[{len(rows)}/{n_starts}] minima: {len(minima)}, "
+                      f"aborted: {sum(r['aborted'] for r in wave)}, skipped: {sum(r['skipped'] for r in wave)}")
+
+    minima_table = pd.DataFrame(minima, columns=["x", "f", "hits", "first_run"])
+    minima_table["x"] = minima_table["x"].map(lambda x: np.asarray(x).tolist())
+    minima_table = minima_table.rename_axis("basin").sort_values("f")
+    runs = pd.DataFrame(rows).drop(columns=["known_basin"]).sort_values("run").reset_index(drop=True)
+    for column in ("x0", "x"):
+        runs[column] = runs[column].map(lambda x: np.asarray(x).tolist())
+    return BasinDiscoveryResult(minima=minima_table, runs=runs, wall_time=time.perf_counter() - start)
@@ -0,0 +1,190 @@
+import itertools
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from methods.abstractions.abstract_optimizator import OptimizationResult
+
+# Декларативный перебор экспериментов: декартово произведение функций,
+# начальных точек, стратегий и наборов гиперпараметров, выполняемое в пуле
+# процессов. Оптимизатор создаётся как в optuna_scripts:
+#     optimizer_class(f, x0, grad=grad, hess=hess, **hyperparams)
+# Всё, что передаётся в пул (функции, стратегии, класс оптимизатора), должно
+# сериализоваться pickle — т.е. быть определено на уровне модуля, не lambda.
+
+FunctionTriple = Tuple[Callable, Optional[Callable], Optional[Callable]]
+
+
+@dataclass
+class ExperimentCase:
+    """Один запуск оптимизатора из сетки экспериментов."""
+    case_id: int
+    optimizer_class: type
+    function: FunctionTriple
+    x0: np.ndarray
+    strategy: Any
+    hyperparams: Dict[str, Any]
+    strategy_param: Optional[str]
+    seed: int
+
+    @property
+    def function_name(self) -> str:
+        return self.function[0].__name__
+
+    @property
+    def strategy_name(self) -> str:
+        return getattr(self.strategy, "__name__", str(self.strategy))
+
+    def label(self) -> List[str]:
+        """Параметры запуска для имени файла отчёта (как в single_test)."""
+        parts = [self.function_name, str(self.x0)]
+        if self.strategy_param is not None:
+            parts.append(self.strategy_name)
+        return parts + [str(self.hyperparams), str(self.case_id)]
+
+    def build(self):
+        f, grad, hess = self.function
+        kwargs = dict(self.hyperparams)
+        if self.strategy_param is not None:
+            kwargs[self.strategy_param] = self.strategy
+        return self.optimizer_class(f, self.x0, grad=grad, hess=hess, **kwargs)
+
+
+@dataclass
+class ExperimentGrid:
+    """
+    Сетка экспериментов для одного класса оптимизатора.
+
+    Атрибуты:
+        optimizer_class: класс оптимизатора.
+        functions: список кортежей (f, grad, hess); grad и hess могут быть None.
+        x0s: список начальных точек.
+        strategies: список стратегий (см. strategy_param).
+        hyperparams: список словарей гиперпараметров.
+        strategy_param: имя аргумента, через который передаётся стратегия
+            ('strategy', 'line_search_method', 'step_selector', ...);
+            None — стратегии не используются.
+        seed: базовое зерно; зёрна запусков порождаются через SeedSequence.spawn,
+            поэтому результат не зависит от числа процессов и порядка выполнения.
+    """
+    optimizer_class: type
+    functions: Sequence[FunctionTriple]
+    x0s: Sequence[np.ndarray]
+    strategies: Sequence[Any] = (None,)
+    hyperparams: Sequence[Dict[str, Any]] = field(default_factory=lambda: [{}])
+    strategy_param: Optional[str] = None
+    seed: int = 0
+
+    def cases(self) -> List[ExperimentCase]:
+        combinations = list(itertools.product(self.functions, self.x0s, self.strategies, self.hyperparams))
+        seeds = np.random.SeedSequence(self.seed).spawn(len(combinations))
+        return [
+            ExperimentCase(case_id=i,
+                           optimizer_class=self.optimizer_class,
+                           function=function,
+                           x0=np.asarray(x0, dtype=float),
+                           strategy=strategy,
+                           hyperparams=dict(hyperparams),
+                           strategy_param=self.strategy_param,
+                           seed=int(seed_seq.generate_state(1)[0]))
+            for i, ((function, x0, strategy, hyperparams), seed_seq) in enumerate(zip(combinations, seeds))
+        ]
+
+
+def run_case(case: ExperimentCase, render: bool = False) -> Dict[str, Any]:
+    """
+    Выполняет один запуск и возвращает строку итоговой таблицы.
+
+    Глобальный генератор NumPy инициализируется зерном запуска (его использует,
+    например, noisy_quadratic_function). Исключение оптимизатора не прерывает
+    сетку — оно записывается в столбец error.
+    """
+    np.random.seed(case.seed)
+    row: Dict[str, Any] = {
+        "case_id": case.case_id,
+        "optimizer": case.optimizer_class.__name__,
+        "function": case.function_name,
+        "x0": case.x0.tolist(),
+        "strategy": case.strategy_name if case.strategy_param is not None else None,
+        "hyperparams": case.hyperparams,
+        "seed": case.seed,
+    }
+    start = time.perf_counter()
+    try:
+        optimizer = case.build()
+        result: OptimizationResult = optimizer.run()
+        row["time"] = time.perf_counter() - start
+        row["f_final"] = float(np.asarray(result.history["f"])[-1])
+        if render:
+            from experiments.base.single_test import draw
+            draw(optimizer, result, " ".join(case.label()[:-2]), case.label())
+        result.history = None
+        row.update({k: (v.tolist() if isinstance(v, np.ndarray) else v)
+                    for k, v in asdict(result).items() if k != "history"})
+        row["error"] = None
+    except Exception:
+        row["time"] = time.perf_counter() - start
+        row["error"] = traceback.format_exc(limit=3)
+    return row
+
+
+def _run_case_star(args: Tuple[ExperimentCase, bool]) -> Dict[str, Any]:
+    return run_case(*args)
+
+
+def run_grid(grids: Sequence[ExperimentGrid] | ExperimentGrid,
+             max_workers: Optional[int] = None,
+             render: bool = False,
+             save_path: Optional[str] = None,
+             verbose: bool = True) -> pd.DataFrame:
+    """
+    Выполняет все запуски одной или нескольких сеток в пуле процессов.
+
+    Args:
+        grids: Сетка или список сеток.
+        max_workers: Число процессов (по умолчанию os.cpu_count());
+            1 — выполнение в текущем процессе без пула.
+        render: Строить ли графики каждого запуска (см. single_test.draw).
+        save_path: Если задан, итоговая таблица сохраняется в CSV.
+        verbose: Печатать ли прогресс.
+
+    Returns:
+        DataFrame: по строке на запуск, упорядочено как в сетке.
+    """
+    if isinstance(grids, ExperimentGrid):
+        grids = [grids]
+    cases = [case for grid in grids for case in grid.cases()]
+    for i, case in enumerate(cases):
+        case.case_id = i
+
+    max_workers = max_workers or os.cpu_count() or 1
+    tasks = [(case, render) for case in cases]
+    rows: List[Dict[str, Any]] = []
+    if max_workers == 1:
+        results = map(_run_case_star, tasks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        chunksize = max(1, len(tasks) // (4 * max_workers))
+        results = executor.map(_run_case_star, tasks, chunksize=chunksize)
+    try:
+        for row in results:
+            rows.append(row)
+            if verbose:
+                status = "failed" if row["error"] else f"f={row['f_final']:.6e}"
+                print(f"[{len(rows)}/{len(tasks)}] {row['optimizer']} {row['function']} "
+                      f"{row['strategy'] or ''} {row['x0']}: {status}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    table = pd.DataFrame(rows)
+    if save_path:
+        table.to_csv(save_path, index=False)
+    return table
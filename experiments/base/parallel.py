@@ -0,0 +1,77 @@
+import multiprocessing
+import pickle
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, Iterator, Optional
+
+# Пул процессов с общими для всех заданий данными (payload).
+#
+# Payload передаётся рабочим процессам один раз, через initializer пула, и
+# читается заданиями через worker_payload(). Если payload сериализуется
+# pickle, используется метод запуска процессов по умолчанию для платформы
+# (spawn на Windows и macOS), поэтому код переносим. Несериализуемый payload
+# (например, словарь lambda для Optuna) можно передать только через fork:
+# он используется, если доступен и безопасен (не macOS), иначе задания
+# выполняются последовательно в текущем процессе.
+
+_PAYLOAD: Dict[str, Any] = {}
+
+
+def worker_payload() -> Dict[str, Any]:
+    """Payload, установленный для текущего процесса (см. payload_executor)."""
+    return _PAYLOAD
+
+
+def _install_payload(payload: Dict[str, Any]) -> None:
+    _PAYLOAD.clear()
+    _PAYLOAD.update(payload)
+
+
+def _pool_context(payload: Dict[str, Any]) -> Optional[BaseContext]:
+    """Контекст multiprocessing для пула или None, если пул создать нельзя."""
+    try:
+        pickle.dumps(payload)
+        return multiprocessing.get_context()
+    except Exception:
+        pass
+    if "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin":
+        return multiprocessing.get_context("fork")
+    return None
+
+
+class _SerialExecutor:
+    """Заменитель пула: выполняет задания по очереди в текущем процессе."""
+
+    def map(self, fn, *iterables, **kwargs):
+        return map(fn, *iterables)
+
+
+@contextmanager
+def payload_executor(payload: Dict[str, Any], max_workers: int) -> Iterator[Any]:
+    """
+    Пул из max_workers процессов, в каждом из которых worker_payload()
+    возвращает payload. Возвращаемый объект поддерживает map(fn, tasks);
+    fn и задания должны сериализоваться pickle (функции уровня модуля).
+
+    При max_workers <= 1, а также если payload не сериализуется и fork
+    недоступен, задания выполняются в текущем процессе (во втором случае —
+    с предупреждением RuntimeWarning).
+    """
+    context = _pool_context(payload) if max_workers > 1 else None
+    if max_workers > 1 and context is None:
+        warnings.warn("Payload is not picklable and the 'fork' start method is unavailable; "
+                      "running tasks serially", RuntimeWarning, stacklevel=3)
+    if context is None:
+        _install_payload(payload)
+        try:
+            yield _SerialExecutor()
+        finally:
+            _PAYLOAD.clear()
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                             initializer=_install_payload, initargs=(payload,)) as executor:
+        yield executor
@@ -1,29 +1,46 @@
 from dataclasses import asdict
-from typing import List
+from typing import List, Optional
 
 from methods.abstractions.abstract_optimizator import AbstractOptimizer, OptimizationResult
 from utils.paths import get_report_path
 from visualizations.data_table import render_test_table
 from visualizations.plotting import plot_full_history, plot_surface_and_trajectory, \
     plot_surface_and_trajectory_with_path
+from visualizations.rendering import BatchRenderer
 
 
-def single_test(optimizer: AbstractOptimizer, plot_title: str, filename_unique_params: List[str]) -> None:
+def single_test(optimizer: AbstractOptimizer, plot_title: str, filename_unique_params: List[str],
+                renderer: Optional[BatchRenderer] = None) -> None:
+    """
+    Запускает оптимизатор, строит графики и сохраняет таблицу результатов.
+
+    Если передан renderer (BatchRenderer), графики строятся через него:
+    с переиспользованием фигур, фоновым сохранением или отложенно (mode='deferred').
+    Файлы дописываются в фоне; renderer закрывается вызывающим кодом один раз
+    после серии запусков (with BatchRenderer() as renderer: ...), и тогда же
+    пробрасываются ошибки записи, не замеченные при следующих вызовах render.
+    """
     result: OptimizationResult = optimizer.run()
 
-    draw(optimizer, result, plot_title, filename_unique_params)
+    draw(optimizer, result, plot_title, filename_unique_params, renderer)
 
     table(optimizer, result, filename_unique_params)
 
-def draw(optimizer: AbstractOptimizer, result: OptimizationResult, plot_title: str, filename_unique_params: List[str]):
+def draw(optimizer: AbstractOptimizer, result: OptimizationResult, plot_title: str, filename_unique_params: List[str],
+         renderer: Optional[BatchRenderer] = None):
+    extension = ".png"
     filename = get_report_path(
         optimizer.name,
         "plot",
         "result",
         filename_unique_params,
-        ".png"
+        extension
     )
 
+    if renderer is not None:
+        renderer.render(optimizer.fun, result.history, plot_title, lim=4, stem=filename[:-len(extension)])
+        return
+
     plot_full_history(
         history=result.history,
         f=optimizer.fun,
@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+from scipy.linalg import blas
+from tabulate import tabulate
+
+from methods.newton.custom_bfgs import bfgs_inverse_update
+from utils.paths import get_report_path
+
+
+def dense_step(H: np.ndarray, grad: np.ndarray, s: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Итерация прежней реализации CustomBfgs: направление и обновление через eye/outer/dot."""
+    n = grad.size
+    p = -H.dot(grad)
+    rho = 1.0 / np.dot(y, s)
+    I = np.eye(n)
+    H = (I - rho * np.outer(s, y)).dot(H).dot(I - rho * np.outer(y, s)) + rho * np.outer(s, s)
+    return H, p
+
+
+def inplace_step(H: np.ndarray, grad: np.ndarray, s: np.ndarray, y: np.ndarray,
+                 p: np.ndarray, Hy: np.ndarray, u: np.ndarray) -> None:
+    """Итерация текущей реализации: dsymv для направления и dsyr2 для обновления."""
+    blas.dsymv(-1.0, H, grad, beta=0.0, y=p, overwrite_y=True)
+    bfgs_inverse_update(H, s, y, 1.0 / np.dot(y, s), Hy, u)
+
+
+def time_per_iteration(step, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        step()
+    return (time.perf_counter() - start) / repeats
+
+
+def benchmark(dims, repeats: int = 5, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in dims:
+        grad, s = rng.standard_normal(n), rng.standard_normal(n)
+        y = s + 0.1 * rng.standard_normal(n)  # yᵀs > 0
+
+        state = {"H": np.eye(n)}
+
+        def run_dense():
+            state["H"], _ = dense_step(state["H"], grad, s, y)
+
+        H = np.asfortranarray(np.eye(n))
+        p, Hy, u = np.empty(n), np.empty(n), np.empty(n)
+
+        def run_inplace():
+            inplace_step(H, grad, s, y, p, Hy, u)
+
+        dense_repeats = max(1, repeats if n <= 1000 else 1)
+        t_dense = time_per_iteration(run_dense, dense_repeats)
+        t_inplace = time_per_iteration(run_inplace, repeats)
+        rows.append({
+            "n": n,
+            "dense, s/iter": f"{t_dense:.4e}",
+            "in-place, s/iter": f"{t_inplace:.4e}",
+            "speedup": f"{t_dense / t_inplace:.1f}x",
+        })
+        print(f"n={n}: dense {t_dense:.4e} s, in-place {t_inplace:.4e} s")
+    return rows
+
+
+results = benchmark([100, 500, 1000, 2000, 5000])
+table = tabulate(results, headers="keys", tablefmt="fancy_grid")
+print(table)
+
+with open(get_report_path("CustomBFGS", "benchmark", "bfgs_update", extension=".txt"), "w", encoding="utf-8") as out:
+    out.write(table)
@@ -1,9 +1,15 @@
 import os
+import time
+import uuid
+
 import optuna
 import numpy as np
 import pandas as pd
+from optuna.study import MaxTrialsCallback
+from optuna.trial import TrialState
 from typing import Callable, Dict, Any, List, Tuple
 
+from experiments.base.parallel import payload_executor, worker_payload
 from functions.funcs import *
 
 optuna.logging.set_verbosity(optuna.logging.ERROR)
@@ -14,6 +20,29 @@ optuna_functions = [
     (sincos_landscape, grad_sincos_landscape, sincos_hessian)
 ]
 
+# Известные глобальные минимумы: в многокритериальном режиме первым критерием
+# служит f(x) - f*. Для функций без известного f* используется само f(x).
+known_minima: Dict[str, float] = {
+    "quadratic_cond_1": 0.0,
+    "quadratic_cond_10": 0.0,
+    "quadratic_cond_100": 0.0,
+    "quadratic_cond_1000": 0.0,
+    "quadratic_function": 0.0,
+    "rosenbrock_function": 0.0,
+    "himmelblau_function": 0.0,
+    "three_hump_camel_function": 0.0,
+}
+
+# Критерии многокритериального режима (все минимизируются). Время работы
+# зашумлено и делает фронт Парето невоспроизводимым, поэтому оно добавляется
+# только по запросу (include_wall_time=True).
+MULTI_OBJECTIVE_METRICS = ["suboptimality", "function_calls", "gradient_calls", "hessian_calls"]
+WALL_TIME_METRIC = "wall_time"
+
+
+def multi_objective_metrics(include_wall_time: bool = False) -> List[str]:
+    return MULTI_OBJECTIVE_METRICS + [WALL_TIME_METRIC] if include_wall_time else list(MULTI_OBJECTIVE_METRICS)
+
 
 def _objective(
     trial: optuna.Trial,
@@ -24,13 +53,37 @@ def _objective(
     x0: np.ndarray,
     search_space: Dict[str, Callable[[optuna.Trial], Any]],
     fixed_kwargs: Dict[str, Any],
-) -> float:
+    report_interval: int = 0,
+    multi_objective: bool = False,
+    f_star: float | None = None,
+    include_wall_time: bool = False,
+) -> float | Tuple[float, ...]:
     """
     Внутренняя функция-цель для Optuna: собирает гиперпараметры произвольного вида.
+
+    Если report_interval > 0, каждые report_interval итераций текущее f(x)
+    передаётся в trial.report, и испытание прерывается (TrialPruned), как
+    только прунер сочтёт его бесперспективным. Нечисловое f (NaN, ±inf —
+    расходящийся метод) прерывает испытание сразу.
+
+    В многокритериальном режиме возвращает кортеж multi_objective_metrics:
+    f(x) - f* (или f(x), если f* неизвестен), число вызовов функции,
+    градиента и гессиана и, если include_wall_time, время работы в секундах.
     """
     trial_params = {name: suggest_fn(trial) for name, suggest_fn in search_space.items()}
 
     optimizer_kwargs = {**fixed_kwargs, **trial_params}
+    if report_interval > 0:
+        def report_progress(k: int, x: np.ndarray, f: float) -> bool:
+            if not np.isfinite(f):
+                raise optuna.TrialPruned(f"Non-finite objective at iteration {k}")
+            if k % report_interval == 0:
+                trial.report(float(f), k)
+                if trial.should_prune():
+                    raise optuna.TrialPruned(f"Pruned at iteration {k}")
+            return False
+
+        optimizer_kwargs["callback"] = report_progress
 
     optimizer = optimizer_class(
         func,
@@ -39,9 +92,106 @@ def _objective(
         hess=hess_func,
         **optimizer_kwargs,
     )
-    _, history = optimizer.optimize()
+    start = time.perf_counter()
+    result = optimizer.run()
+    wall_time = time.perf_counter() - start
+
+    value = result.history["f"][-1]
+    if not np.isfinite(value):
+        raise optuna.TrialPruned("Non-finite final objective")
+    if multi_objective:
+        # Вычисления, потраченные на разностный гессиан, входят в стоимость.
+        fd_function = result.hessian_fd_call_count if result.hessian_strategy == "function_differences" else 0
+        fd_gradient = result.hessian_fd_call_count - fd_function
+        values = (value - f_star if f_star is not None else value,
+                  result.function_call_count + fd_function,
+                  result.gradient_call_count + fd_gradient,
+                  result.hessian_call_count)
+        return values + (wall_time,) if include_wall_time else values
+    return value
+
+
+def make_pruner(pruner: str | optuna.pruners.BasePruner | None,
+                report_interval: int = 10) -> optuna.pruners.BasePruner:
+    """
+    Прунер по имени: 'median' (медиана промежуточных значений завершённых
+    испытаний на том же шаге), 'hyperband' или None (без отсечения).
+    Готовый объект optuna.pruners.BasePruner возвращается как есть.
+    """
+    if pruner is None:
+        return optuna.pruners.NopPruner()
+    if isinstance(pruner, optuna.pruners.BasePruner):
+        return pruner
+    if pruner == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=2 * report_interval,
+                                           interval_steps=report_interval)
+    if pruner == "hyperband":
+        return optuna.pruners.HyperbandPruner(min_resource=2 * report_interval, max_resource="auto")
+    raise ValueError(f"Unknown pruner: {pruner}")
+
+
+_FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+
+
+def make_storage(storage: str | None):
+    """
+    Создаёт хранилище Optuna по строке.
 
-    return history["f"][-1] 
+    URL базы данных ('sqlite:///study.db', 'postgresql://...') передаётся
+    Optuna как есть; любая другая строка считается путём к журнальному файлу
+    (JournalStorage), который безопасно использовать из нескольких процессов.
+    """
+    if storage is None or "://" in storage:
+        return storage
+    journal = optuna.storages.journal
+    backend = getattr(journal, "JournalFileBackend", None) or optuna.storages.JournalFileStorage
+    return optuna.storages.JournalStorage(backend(storage))
+
+
+def study_name_for(optimizer_class: Callable, func: Callable, multi_objective: bool = False,
+                   include_wall_time: bool = False) -> str:
+    name = f"{optimizer_class.__name__}_{func.__name__}"
+    if not multi_objective:
+        return name
+    return name + "_multi_time" if include_wall_time else name + "_multi"
+
+
+def _finished_trials(study: optuna.Study) -> int:
+    return len(study.get_trials(deepcopy=False, states=_FINISHED_STATES))
+
+
+def _run_study_worker(func_index: int) -> int:
+    """Рабочий процесс: дописывает испытания в общее исследование до n_trials."""
+    payload = worker_payload()
+    func, grad_func, hess_func = payload["functions"][func_index]
+    study = optuna.load_study(
+        study_name=study_name_for(payload["optimizer_class"], func, payload["multi_objective"],
+                                  payload["include_wall_time"]),
+        storage=make_storage(payload["storage"]),
+        pruner=payload["pruner"],
+    )
+    remaining = payload["n_trials"] - _finished_trials(study)
+    if remaining <= 0:
+        return 0
+    study.optimize(
+        lambda tr: _objective(
+            tr,
+            func,
+            grad_func,
+            hess_func,
+            payload["optimizer_class"],
+            payload["x0"],
+            payload["search_space"],
+            payload["fixed_kwargs"],
+            payload["report_interval"],
+            payload["multi_objective"],
+            known_minima.get(func.__name__),
+            payload["include_wall_time"],
+        ),
+        n_trials=remaining,
+        callbacks=[MaxTrialsCallback(payload["n_trials"], states=_FINISHED_STATES)],
+    )
+    return remaining
 
 
 def optimize_for_all_functions(
@@ -53,6 +203,12 @@ def optimize_for_all_functions(
     fixed_kwargs: Dict[str, Any] | None = None,
     n_trials: int = 50,
     report_dir: str = "optuna_report",
+    n_jobs: int = 1,
+    storage: str | None = None,
+    pruner: str | optuna.pruners.BasePruner | None = None,
+    report_interval: int = 10,
+    multi_objective: bool = False,
+    include_wall_time: bool = False,
 ) -> pd.DataFrame:
     """
     Универсальный перебор гиперпараметров для набора тестовых функций.
@@ -66,10 +222,35 @@ def optimize_for_all_functions(
     fixed_kwargs    : фиксированные параметры, которые не тюним
     n_trials        : количество экспериментов Optuna на каждую функцию
     report_dir      : куда сохранить итоговый .csv-отчёт
+    n_jobs          : число рабочих процессов; при n_jobs > 1 исследования всех
+                      функций выполняются одновременно, испытания одного
+                      исследования распределяются между процессами. Если
+                      search_space не сериализуется pickle (lambda), а fork
+                      недоступен (Windows, macOS), перебор идёт в одном процессе
+    storage         : путь к журнальному файлу или URL базы данных Optuna
+                      (например, 'sqlite:///optuna.db'). Если хранилище уже
+                      содержит исследование, оно продолжается: выполняются только
+                      недостающие до n_trials испытания. При n_jobs > 1 без
+                      storage для каждого вызова создаётся новый журнал в
+                      report_dir, и перебор начинается заново
+    pruner          : 'median', 'hyperband', объект прунера Optuna или None
+                      (по умолчанию — без отсечения); испытания, заведомо
+                      проигрывающие (в том числе расходящиеся), останавливаются
+                      досрочно
+    report_interval : как часто (в итерациях) оптимизатор сообщает f(x) прунеру
+    multi_objective : многокритериальный режим: одновременно минимизируются
+                      f(x) - f* и числа вызовов функции, градиента и гессиана
+                      (MULTI_OBJECTIVE_METRICS). Отсечение испытаний в этом
+                      режиме отключено, фронт Парето сохраняется в отдельный
+                      файл <optimizer>_pareto.csv
+    include_wall_time : добавить время работы в критерии многокритериального
+                      режима (фронт начинает зависеть от шума измерений)
 
     Returns
     -------
-    results_df      : DataFrame с лучшими гиперпараметрами для каждой функции
+    results_df      : DataFrame с лучшими гиперпараметрами для каждой функции;
+                      в многокритериальном режиме — фронт Парето каждой функции
+                      (по строке на испытание: значения критериев и параметры)
     """
     if x0 is None:
         x0 = np.array([1.0, 1.0])
@@ -77,28 +258,97 @@ def optimize_for_all_functions(
 
     os.makedirs(report_dir, exist_ok=True)
     report_file = os.path.join(
-        report_dir, f"{optimizer_class.__name__}_optimization_results.csv"
+        report_dir,
+        f"{optimizer_class.__name__}_pareto.csv" if multi_objective
+        else f"{optimizer_class.__name__}_optimization_results.csv"
     )
+    metrics = multi_objective_metrics(include_wall_time)
+    # Исследование продолжается только в хранилище, явно переданном вызывающим:
+    # имя исследования не зависит от search_space, fixed_kwargs и x0, и
+    # неявное продолжение выдало бы старые результаты за новые.
+    resume = storage is not None
+    if n_jobs > 1 and storage is None:
+        # Журнал нужен только для обмена испытаниями между процессами, поэтому
+        # у каждого вызова он свой.
+        storage = os.path.join(report_dir, f"{optimizer_class.__name__}_{time.strftime('%Y%m%d-%H%M%S')}_"
+                                           f"{uuid.uuid4().hex[:8]}.journal")
 
-    results: List[Dict[str, Any]] = []
+    # Optuna не поддерживает trial.report для многокритериальных исследований.
+    pruner = make_pruner(None if multi_objective else pruner, report_interval)
+    if isinstance(pruner, optuna.pruners.NopPruner):
+        report_interval = 0
 
-    for func, grad_func, hess_func in functions:
-        print(f"Optimizing {func.__name__} with {optimizer_class.__name__}")
-
-        study = optuna.create_study(direction="minimize")
-        study.optimize(
-            lambda tr: _objective(
-                tr,
-                func,
-                grad_func,
-                hess_func,
-                optimizer_class,
-                x0,
-                search_space,
-                fixed_kwargs,
-            ),
+    studies = {}
+    for func, _, _ in functions:
+        studies[func.__name__] = optuna.create_study(
+            study_name=study_name_for(optimizer_class, func, multi_objective, include_wall_time),
+            storage=make_storage(storage),
+            directions=["minimize"] * (len(metrics) if multi_objective else 1),
+            load_if_exists=resume,
+            pruner=pruner,
+        )
+        if multi_objective:
+            studies[func.__name__].set_metric_names(metrics)
+
+    if n_jobs > 1:
+        # search_space обычно состоит из lambda, которые не сериализуются
+        # pickle: тогда рабочие процессы создаются через fork, а там, где он
+        # недоступен, испытания выполняются последовательно (payload_executor).
+        payload = dict(
+            functions=list(functions),
+            optimizer_class=optimizer_class,
+            x0=x0,
+            search_space=search_space,
+            fixed_kwargs=fixed_kwargs,
             n_trials=n_trials,
+            storage=storage,
+            pruner=pruner,
+            report_interval=report_interval,
+            multi_objective=multi_objective,
+            include_wall_time=include_wall_time,
         )
+        print(f"Optimizing {len(functions)} functions with {optimizer_class.__name__} on {n_jobs} processes")
+        # На каждую функцию — до n_jobs заданий; лишние задания завершаются
+        # сразу, как только исследование набирает n_trials испытаний.
+        tasks = [i for _ in range(n_jobs) for i in range(len(functions))]
+        with payload_executor(payload, n_jobs) as executor:
+            list(executor.map(_run_study_worker, tasks))
+        for name in studies:
+            studies[name] = optuna.load_study(study_name=studies[name].study_name, storage=make_storage(storage),
+                                              pruner=pruner)
+
+    results: List[Dict[str, Any]] = []
+
+    for func, grad_func, hess_func in functions:
+        study = studies[func.__name__]
+        remaining = n_trials - _finished_trials(study)
+        if n_jobs <= 1 and remaining > 0:
+            print(f"Optimizing {func.__name__} with {optimizer_class.__name__}")
+            study.optimize(
+                lambda tr: _objective(
+                    tr,
+                    func,
+                    grad_func,
+                    hess_func,
+                    optimizer_class,
+                    x0,
+                    search_space,
+                    fixed_kwargs,
+                    report_interval,
+                    multi_objective,
+                    known_minima.get(func.__name__),
+                    include_wall_time,
+                ),
+                n_trials=remaining,
+            )
+
+        if multi_objective:
+            front = sorted(study.best_trials, key=lambda t: t.values)
+            print(f"Pareto front for {func.__name__}: {len(front)} trials\n{'-'*50}")
+            for trial in front:
+                results.append({"Function": func.__name__, "Trial": trial.number,
+                                **dict(zip(metrics, trial.values)), **trial.params})
+            continue
 
         best_params = study.best_params
         print(f"Best params for {func.__name__}: {best_params}\n{'-'*50}")
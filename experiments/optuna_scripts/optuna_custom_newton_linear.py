@@ -10,6 +10,7 @@ search_space = {
     ),
     "initial_lr": lambda tr: tr.suggest_float("initial_lr", 1e-4, 1e-1, log=True),
     "alpha": lambda tr: tr.suggest_float("alpha", 0.1, 1.0),
+    "hess_refresh": lambda tr: tr.suggest_int("hess_refresh", 1, 5),
 }
 
 fixed_kwargs = {
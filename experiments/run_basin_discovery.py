@@ -0,0 +1,32 @@
+import argparse
+
+from experiments.base.basin_discovery import SAMPLERS, discover_basins
+from functions.funcs import *
+from methods.newton.custom_bfgs import CustomBfgs
+from utils.paths import get_report_path
+
+functions = [
+    (himmelblau_function, himmelblau_grad, himmelblau_hessian),
+    (three_hump_camel_function, three_hump_camel_grad, three_hump_camel_hessian),
+    (sincos_landscape, grad_sincos_landscape, sincos_hessian),
+]
+bounds = [(-5.0, 5.0), (-5.0, 5.0)]
+hyperparams = {'alpha_init': 1, 'tau': 0.5, 'c': 1e-4, 'tol': 1e-6, 'max_iter': 1500}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find all minima by multi-start local search")
+    parser.add_argument("--starts", type=int, default=256, help="number of start points")
+    parser.add_argument("--sampler", choices=SAMPLERS, default="sobol")
+    parser.add_argument("--radius", type=float, default=0.1, help="basin radius for deduplication and early abort")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--no-abort", action="store_true", help="run every start to convergence")
+    args = parser.parse_args()
+
+    for function in functions:
+        name = function[0].__name__
+        result = discover_basins(CustomBfgs, function, bounds, n_starts=args.starts, sampler=args.sampler,
+                                 radius=args.radius, hyperparams=hyperparams, max_workers=args.workers,
+                                 early_abort=not args.no_abort, verbose=False)
+        print(f"\n{name}: {len(result.minima)} minima in {result.wall_time:.2f}s, cost {result.total_cost}")
+        print(result.minima.to_string())
+        result.minima.to_csv(get_report_path("basins", "table", name, extension=".csv"))
@@ -0,0 +1,50 @@
+import argparse
+
+from experiments.base.grid_runner import ExperimentGrid, run_grid
+from functions.funcs import *
+from methods.linear_search import golden_section_line_search, ternary_search_line
+from methods.newton.custom_bfgs import CustomBfgs
+from methods.newton.newton_linear import NewtonLineSearch
+from methods.scheduled_gradient_descent.scheduled_gradient_descent import CustomScheduledGradientDescent
+from methods.steepest_gradient_descent.steepest_gradient_descent import CustomGradientDescentOptimizer
+from utils.paths import get_report_path
+
+functions = [
+    (quadratic_cond_1, grad_quadratic_cond_1, hess_quadratic_cond_1),
+    (quadratic_cond_100, grad_quadratic_cond_100, hess_quadratic_cond_100),
+    (rosenbrock_function, rosenbrock_grad, rosenbrock_hessian),
+    (himmelblau_function, himmelblau_grad, himmelblau_hessian),
+    (three_hump_camel_function, three_hump_camel_grad, three_hump_camel_hessian),
+    (sincos_landscape, grad_sincos_landscape, sincos_hessian),
+]
+x_0s = [np.array([1.0, 1.0]), np.array([-4.0, -4.0]), np.array([-5.0, 10.0])]
+
+grids = [
+    ExperimentGrid(CustomScheduledGradientDescent, functions, x_0s,
+                   strategies=['constant', 'exp_decay', 'piecewise', 'poly_decay'],
+                   strategy_param='strategy',
+                   hyperparams=[{'initial_lr': 0.1, 'step_size': 40, 'alpha': 0.5, 'beta': 1,
+                                 'lambda_exp': 0.01, 'tol': 1e-6, 'max_iter': 1500},
+                                {'initial_lr': 0.01, 'step_size': 40, 'alpha': 0.5, 'beta': 1,
+                                 'lambda_exp': 0.01, 'tol': 1e-6, 'max_iter': 1500}]),
+    ExperimentGrid(CustomGradientDescentOptimizer, functions, x_0s,
+                   strategies=[golden_section_line_search, ternary_search_line],
+                   strategy_param='line_search_method',
+                   hyperparams=[{'tol': 1e-6, 'max_iter': 1500}]),
+    ExperimentGrid(NewtonLineSearch, functions, x_0s,
+                   strategies=[golden_section_line_search],
+                   strategy_param='step_selector',
+                   hyperparams=[{'tol': 1e-6, 'max_iter': 1500}]),
+    ExperimentGrid(CustomBfgs, functions, x_0s,
+                   hyperparams=[{'alpha_init': 1, 'tau': 0.5, 'c': 1e-4, 'tol': 1e-6, 'max_iter': 1500}]),
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the experiment grid on a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--render", action="store_true", help="save plots for every run")
+    args = parser.parse_args()
+
+    table = run_grid(grids, max_workers=args.workers, render=args.render,
+                     save_path=get_report_path("grid", "table", "sweep", extension=".csv"))
+    print(table[["optimizer", "function", "strategy", "x0", "iterations", "f_final", "time"]].to_string())
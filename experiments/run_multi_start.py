@@ -0,0 +1,40 @@
+import argparse
+import time
+
+from functions.funcs import *
+from methods.linear_search import golden_section_line_search
+from methods.multi_start import MultiStartOptimizer
+from methods.newton.custom_bfgs import CustomBfgs
+from methods.scheduled_gradient_descent.scheduled_gradient_descent import CustomScheduledGradientDescent
+from methods.steepest_gradient_descent.steepest_gradient_descent import CustomGradientDescentOptimizer
+
+functions = [
+    (himmelblau_function, himmelblau_grad),
+    (sincos_landscape, grad_sincos_landscape),
+]
+
+optimizers = [
+    (CustomScheduledGradientDescent, {'strategy': 'exp_decay', 'initial_lr': 0.01, 'lambda_exp': 0.001,
+                                      'tol': 1e-6, 'max_iter': 1500}),
+    (CustomGradientDescentOptimizer, {'line_search_method': golden_section_line_search, 'tol': 1e-6, 'max_iter': 1500}),
+    (CustomBfgs, {'alpha_init': 1, 'tau': 0.5, 'c': 1e-4, 'tol': 1e-6, 'max_iter': 1500}),
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-start runs advanced in lockstep")
+    parser.add_argument("--starts", type=int, default=2000, help="number of random start points")
+    parser.add_argument("--bound", type=float, default=5.0, help="start points are drawn from [-bound, bound]^2")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    x_0s = np.random.default_rng(args.seed).uniform(-args.bound, args.bound, size=(args.starts, 2))
+    for f, grad in functions:
+        for optimizer_class, hyperparams in optimizers:
+            start = time.perf_counter()
+            result = MultiStartOptimizer(optimizer_class, f, x_0s, grad, **hyperparams).run()
+            elapsed = time.perf_counter() - start
+            x_best, f_best = result.best()
+            minima = np.unique(np.round(result.x[result.converged], 4), axis=0)
+            print(f"{f.__name__} {optimizer_class.__name__}: {elapsed:.2f}s, "
+                  f"converged {result.converged.sum()}/{args.starts}, distinct minima {len(minima)}, "
+                  f"best f={f_best:.6e} at {x_best}, f calls={result.function_call_count}")
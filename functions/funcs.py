@@ -1,69 +1,98 @@
 import numpy as np
 
+from utils.batch import vectorized
+
+# Все функции, градиенты и гессианы этого модуля векторизованы: они принимают
+# как одну точку формы (2,), так и пакет точек формы (m, 2), и возвращают
+# результаты формы (m,), (m, 2) и (m, 2, 2) соответственно.
+
+
+def _stack_gradient(dx, dy) -> np.ndarray:
+    """Собирает градиент (..., 2) из покомпонентных производных."""
+    return np.stack(np.broadcast_arrays(dx, dy), axis=-1)
+
+
+def _stack_hessian(x: np.ndarray, h11, h12, h22) -> np.ndarray:
+    """Собирает симметричный гессиан (..., 2, 2) из его элементов."""
+    hess = np.empty(np.shape(x)[:-1] + (2, 2))
+    hess[..., 0, 0] = h11
+    hess[..., 0, 1] = h12
+    hess[..., 1, 0] = h12
+    hess[..., 1, 1] = h22
+    return hess
+
 
 # ==== КВАДРАТИЧНЫЕ ФОРМЫ С РАЗНЫМ ЧИСЛОМ ОБУСЛОВЛЕННОСТЕЙ ====
 
+@vectorized
 def quadratic_cond_1(x: np.ndarray) -> float:
     """Квадратичная функция с числом обусловленности 1: f(x, y) = x^2 + y^2"""
-    return x[0] ** 2 + x[1] ** 2
+    return x[..., 0] ** 2 + x[..., 1] ** 2
 
 
+@vectorized
 def quadratic_cond_10(x: np.ndarray) -> float:
     """Квадратичная функция с числом обусловленности 10: f(x, y) = 10x^2 + y^2"""
-    return 10 * x[0] ** 2 + x[1] ** 2
+    return 10 * x[..., 0] ** 2 + x[..., 1] ** 2
 
 
+@vectorized
 def quadratic_cond_100(x: np.ndarray) -> float:
     """Квадратичная функция с числом обусловленности 100: f(x, y) = 100x^2 + y^2"""
-    return 100 * x[0] ** 2 + x[1] ** 2
+    return 100 * x[..., 0] ** 2 + x[..., 1] ** 2
 
 
+@vectorized
 def quadratic_cond_1000(x: np.ndarray) -> float:
     """Квадратичная функция с числом обусловленности 1000: f(x, y) = 1000x^2 + y^2"""
-    return 1000 * x[0] ** 2 + x[1] ** 2
+    return 1000 * x[..., 0] ** 2 + x[..., 1] ** 2
 
 
 QUADRATIC_LIST = [quadratic_cond_1, quadratic_cond_10, quadratic_cond_100, quadratic_cond_1000]
 
 
+@vectorized
 def grad_quadratic_cond_1(x: np.ndarray) -> np.ndarray:
     """Градиент функции f(x, y) = x^2 + y^2"""
-    return np.array([2 * x[0], 2 * x[1]])
+    return _stack_gradient(2 * x[..., 0], 2 * x[..., 1])
 
+@vectorized
 def grad_quadratic_cond_10(x: np.ndarray) -> np.ndarray:
     """Градиент функции f(x, y) = 10x^2 + y^2"""
-    return np.array([20 * x[0], 2 * x[1]])
+    return _stack_gradient(20 * x[..., 0], 2 * x[..., 1])
 
+@vectorized
 def grad_quadratic_cond_100(x: np.ndarray) -> np.ndarray:
     """Градиент функции f(x, y) = 100x^2 + y^2"""
-    return np.array([200 * x[0], 2 * x[1]])
+    return _stack_gradient(200 * x[..., 0], 2 * x[..., 1])
 
+@vectorized
 def grad_quadratic_cond_1000(x: np.ndarray) -> np.ndarray:
     """Градиент функции f(x, y) = 1000x^2 + y^2"""
-    return np.array([2000 * x[0], 2 * x[1]])
+    return _stack_gradient(2000 * x[..., 0], 2 * x[..., 1])
 
 
 GRAD_QUADRATIC_LIST = [grad_quadratic_cond_1, grad_quadratic_cond_10, grad_quadratic_cond_100, grad_quadratic_cond_1000]
 
+@vectorized
 def hess_quadratic_cond_1(x: np.ndarray) -> np.ndarray:
     """Гессиан функции f(x, y) = x^2 + y^2"""
-    return np.array([[2, 0],
-                     [0, 2]])
+    return _stack_hessian(x, 2, 0, 2)
 
+@vectorized
 def hess_quadratic_cond_10(x: np.ndarray) -> np.ndarray:
     """Гессиан функции f(x, y) = 10x^2 + y^2"""
-    return np.array([[20, 0],
-                     [0, 2]])
+    return _stack_hessian(x, 20, 0, 2)
 
+@vectorized
 def hess_quadratic_cond_100(x: np.ndarray) -> np.ndarray:
     """Гессиан функции f(x, y) = 100x^2 + y^2"""
-    return np.array([[200, 0],
-                     [0, 2]])
+    return _stack_hessian(x, 200, 0, 2)
 
+@vectorized
 def hess_quadratic_cond_1000(x: np.ndarray) -> np.ndarray:
     """Гессиан функции f(x, y) = 1000x^2 + y^2"""
-    return np.array([[2000, 0],
-                     [0, 2]])
+    return _stack_hessian(x, 2000, 0, 2)
 
 HESS_QUADRATIC_LIST = [
     hess_quadratic_cond_1,
@@ -75,54 +104,59 @@ HESS_QUADRATIC_LIST = [
 
 # ==== БАЗОВЫЕ ФУНКЦИИ ====
 
+@vectorized
 def quadratic_function(x: np.ndarray) -> float:
     """Классическая квадратичная функция: f(x, y) = (x - 3)^2 + (y - 2)^2"""
-    return (x[0] - 3) ** 2 + (x[1] - 2) ** 2
+    return (x[..., 0] - 3) ** 2 + (x[..., 1] - 2) ** 2
 
 
+@vectorized
 def quadratic_grad(x: np.ndarray) -> np.ndarray:
     """Градиент квадратичной функции"""
-    return np.array([2 * (x[0] - 3), 2 * (x[1] - 2)])
+    return _stack_gradient(2 * (x[..., 0] - 3), 2 * (x[..., 1] - 2))
 
 
 # ==== СРЕДНИЕ ПО СЛОЖНОСТИ ФУНКЦИИ ====
 
+@vectorized
 def rosenbrock_function(x: np.ndarray) -> float:
     """Функция Розенброка: f(x, y) = (1 - x)^2 + 100 * (y - x^2)^2"""
-    return (1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2
+    return (1 - x[..., 0]) ** 2 + 100 * (x[..., 1] - x[..., 0] ** 2) ** 2
 
 
+@vectorized
 def rosenbrock_grad(x: np.ndarray) -> np.ndarray:
     """Градиент функции Розенброка"""
-    dx = -2 * (1 - x[0]) - 400 * x[0] * (x[1] - x[0] ** 2)
-    dy = 200 * (x[1] - x[0] ** 2)
-    return np.array([dx, dy])
+    dx = -2 * (1 - x[..., 0]) - 400 * x[..., 0] * (x[..., 1] - x[..., 0] ** 2)
+    dy = 200 * (x[..., 1] - x[..., 0] ** 2)
+    return _stack_gradient(dx, dy)
 
+@vectorized
 def rosenbrock_hessian(x: np.ndarray) -> np.ndarray:
     """Хессиан функции Розенброка"""
-    x0, x1 = x[0], x[1]
-    return np.array([
-        [2 - 400 * x1 + 1200 * x0**2, -400 * x0],
-        [-400 * x0, 200]
-    ])
+    x0, x1 = x[..., 0], x[..., 1]
+    return _stack_hessian(x, 2 - 400 * x1 + 1200 * x0**2, -400 * x0, 200)
 
 
 # ==== ПРОДВИНУТЫЕ ФУНКЦИИ ====
 
+@vectorized
 def himmelblau_function(x: np.ndarray) -> float:
     """Функция Химмельблау: f(x, y) = (x^2 + y - 11)^2 + (x + y^2 - 7)^2"""
-    return (x[0] ** 2 + x[1] - 11) ** 2 + (x[0] + x[1] ** 2 - 7) ** 2
+    return (x[..., 0] ** 2 + x[..., 1] - 11) ** 2 + (x[..., 0] + x[..., 1] ** 2 - 7) ** 2
 
 
+@vectorized
 def himmelblau_grad(x: np.ndarray) -> np.ndarray:
     """Градиент функции Химмельблау"""
-    dx = 4 * x[0] * (x[0] ** 2 + x[1] - 11) + 2 * (x[0] + x[1] ** 2 - 7)
-    dy = 2 * (x[0] ** 2 + x[1] - 11) + 4 * x[1] * (x[0] + x[1] ** 2 - 7)
-    return np.array([dx, dy])
+    dx = 4 * x[..., 0] * (x[..., 0] ** 2 + x[..., 1] - 11) + 2 * (x[..., 0] + x[..., 1] ** 2 - 7)
+    dy = 2 * (x[..., 0] ** 2 + x[..., 1] - 11) + 4 * x[..., 1] * (x[..., 0] + x[..., 1] ** 2 - 7)
+    return _stack_gradient(dx, dy)
 
+@vectorized
 def himmelblau_hessian(x: np.ndarray) -> np.ndarray:
     """Гессиан функции Химмельблау: """
-    x0, x1 = x[0], x[1]
+    x0, x1 = x[..., 0], x[..., 1]
     A = x0**2 + x1 - 11
     B = x0 + x1**2 - 7
 
@@ -130,63 +164,67 @@ def himmelblau_hessian(x: np.ndarray) -> np.ndarray:
     d2f_dy2 = 2 + 4 * B + 8 * x1**2
     d2f_dxdy = 4 * x0 + 4 * x1
 
-    return np.array([
-        [d2f_dx2,    d2f_dxdy],
-        [d2f_dxdy,   d2f_dy2]
-    ])
+    return _stack_hessian(x, d2f_dx2, d2f_dxdy, d2f_dy2)
 
+@vectorized
 def three_hump_camel_function(x: np.ndarray) -> float:
     """Функция «трёхгорбый верблюд»: f(x, y) = 2x^2 - 1.05x^4 + x^6/6 + xy + y^2"""
-    return 2 * x[0] ** 2 - 1.05 * x[0] ** 4 + (x[0] ** 6) / 6 + x[0] * x[1] + x[1] ** 2
+    return 2 * x[..., 0] ** 2 - 1.05 * x[..., 0] ** 4 + (x[..., 0] ** 6) / 6 + x[..., 0] * x[..., 1] + x[..., 1] ** 2
 
 
+@vectorized
 def three_hump_camel_grad(x: np.ndarray) -> np.ndarray:
     """Градиент функции трёхгорбого верблюда"""
-    dx = 4 * x[0] - 4.2 * x[0] ** 3 + x[0] ** 5 + x[1]
-    dy = x[0] + 2 * x[1]
-    return np.array([dx, dy])
+    dx = 4 * x[..., 0] - 4.2 * x[..., 0] ** 3 + x[..., 0] ** 5 + x[..., 1]
+    dy = x[..., 0] + 2 * x[..., 1]
+    return _stack_gradient(dx, dy)
 
+@vectorized
 def three_hump_camel_hessian(x: np.ndarray) -> np.ndarray:
     """Хессиан функции трёхгорбого верблюда"""
-    x0 = x[0]
+    x0 = x[..., 0]
     h11 = 4 - 12.6 * x0**2 + 5 * x0**4
-    return np.array([
-        [h11, 1],
-        [1, 2]
-    ])
+    return _stack_hessian(x, h11, 1, 2)
 
+@vectorized
 def noisy_quadratic_function(x: np.ndarray, sigma: float = 0.1) -> float:
     """
     Классическая квадратичная функция с аддитивным гауссовым шумом.
+
+    Для пакета точек шум генерируется независимо для каждой точки.
     """
-    true_value = (x[0] - 3)**2 + (x[1] - 2)**2
-    noise = np.random.normal(0, sigma)
+    true_value = (x[..., 0] - 3)**2 + (x[..., 1] - 2)**2
+    noise = np.random.normal(0, sigma, size=np.shape(true_value))
     return true_value + noise
 
+# Значения случайны, поэтому сетки этой функции не сохраняются в дисковый кэш.
+noisy_quadratic_function.deterministic = False
+
+@vectorized
 def noisy_quadratic_grad(x: np.ndarray) -> np.ndarray:
     """
     Градиент без шума — считаем, что градиент точный.
     """
-    return np.array([2 * (x[0] - 3), 2 * (x[1] - 2)])
+    return _stack_gradient(2 * (x[..., 0] - 3), 2 * (x[..., 1] - 2))
 
+@vectorized
 def sincos_landscape(x: np.ndarray) -> float:
-    return np.sin(x[0]) * np.cos(x[1]) + 0.1 * (x[0]**2 + x[1]**2)
+    return np.sin(x[..., 0]) * np.cos(x[..., 1]) + 0.1 * (x[..., 0]**2 + x[..., 1]**2)
 
+@vectorized
 def grad_sincos_landscape(x: np.ndarray) -> np.ndarray:
     """
     Градиент функции f(x, y) = sin(x) * cos(y) + 0.1 * (x² + y²)
     """
-    df_dx = np.cos(x[0]) * np.cos(x[1]) + 0.2 * x[0]
-    df_dy = -np.sin(x[0]) * np.sin(x[1]) + 0.2 * x[1]
-    return np.array([df_dx, df_dy])
+    df_dx = np.cos(x[..., 0]) * np.cos(x[..., 1]) + 0.2 * x[..., 0]
+    df_dy = -np.sin(x[..., 0]) * np.sin(x[..., 1]) + 0.2 * x[..., 1]
+    return _stack_gradient(df_dx, df_dy)
 
+@vectorized
 def sincos_hessian(x: np.ndarray) -> np.ndarray:
     """Хессиан функции sincos_landscape"""
-    x0, x1 = x[0], x[1]
+    x0, x1 = x[..., 0], x[..., 1]
     h11 = -np.sin(x0) * np.cos(x1) + 0.2
     h22 = -np.sin(x0) * np.cos(x1) + 0.2
     h12 = -np.cos(x0) * np.sin(x1)
-    return np.array([
-        [h11, h12],
-        [h12, h22]
-    ])
+    return _stack_hessian(x, h11, h12, h22)
@@ -0,0 +1,248 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from functions.funcs import (himmelblau_function, himmelblau_grad, himmelblau_hessian,
+                             sincos_landscape, grad_sincos_landscape, sincos_hessian)
+from utils.batch import vectorized
+from utils.sparse_differences import banded_pattern, block_diagonal_pattern, SparsityPattern
+
+# Параметризованные по размерности n тестовые функции. Как и в functions.funcs,
+# все callables векторизованы: точка формы (n,) или пакет формы (m, n).
+# Плотный гессиан занимает O(n²) памяти — при больших n используйте hessp.
+
+
+@dataclass
+class BenchmarkFunction:
+    """
+    Тестовая функция произвольной размерности с аналитическими производными.
+
+    Атрибуты:
+        name: имя функции (с размерностью).
+        n: размерность пространства.
+        f: значение функции.
+        grad: градиент.
+        hess: плотный гессиан (n×n).
+        hessp: произведение гессиана на вектор: hessp(x, v) = ∇²f(x)·v.
+        f_star: известное глобальное минимальное значение (если есть).
+        hess_sparsity: шаблон ненулевых элементов гессиана (None — плотный).
+    """
+    name: str
+    n: int
+    f: Callable[[np.ndarray], np.ndarray]
+    grad: Callable[[np.ndarray], np.ndarray]
+    hess: Callable[[np.ndarray], np.ndarray]
+    hessp: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    f_star: Optional[float] = None
+    hess_sparsity: Optional[SparsityPattern] = None
+
+
+def _set_name(func: Callable, name: str) -> Callable:
+    func.__name__ = func.__qualname__ = name
+    return func
+
+
+# ==== РАСШИРЕННАЯ ФУНКЦИЯ РОЗЕНБРОКА ====
+
+def extended_rosenbrock(n: int) -> BenchmarkFunction:
+    """
+    Расширенная (цепочечная) функция Розенброка:
+    f(x) = Σ_{i=1}^{n-1} [100 (x_{i+1} - x_i²)² + (1 - x_i)²].
+
+    Минимум f* = 0 в точке (1, ..., 1). Гессиан трёхдиагональный.
+    """
+    if n < 2:
+        raise ValueError("Extended Rosenbrock requires n >= 2")
+
+    def f(x):
+        head, tail = x[..., :-1], x[..., 1:]
+        return np.sum(100 * (tail - head ** 2) ** 2 + (1 - head) ** 2, axis=-1)
+
+    def grad(x):
+        head, tail = x[..., :-1], x[..., 1:]
+        r = tail - head ** 2
+        g = np.zeros(np.shape(x), dtype=np.result_type(x, float))
+        g[..., :-1] = -400 * head * r - 2 * (1 - head)
+        g[..., 1:] += 200 * r
+        return g
+
+    def _bands(x):
+        head, tail = x[..., :-1], x[..., 1:]
+        diag = np.zeros(np.shape(x))
+        diag[..., :-1] = 1200 * head ** 2 - 400 * tail + 2
+        diag[..., 1:] += 200
+        return diag, -400 * head
+
+    def hess(x):
+        diag, off = _bands(x)
+        idx = np.arange(n)
+        H = np.zeros(np.shape(x) + (n,))
+        H[..., idx, idx] = diag
+        H[..., idx[:-1], idx[1:]] = off
+        H[..., idx[1:], idx[:-1]] = off
+        return H
+
+    def hessp(x, v):
+        diag, off = _bands(x)
+        hv = diag * v
+        hv[..., :-1] += off * v[..., 1:]
+        hv[..., 1:] += off * v[..., :-1]
+        return hv
+
+    name = f"extended_rosenbrock_{n}d"
+    return BenchmarkFunction(
+        name=name,
+        n=n,
+        f=vectorized(_set_name(f, name)),
+        grad=vectorized(_set_name(grad, f"grad_{name}")),
+        hess=vectorized(_set_name(hess, f"hess_{name}")),
+        hessp=vectorized(_set_name(hessp, f"hessp_{name}")),
+        f_star=0.0,
+        hess_sparsity=banded_pattern(n, 1),
+    )
+
+
+# ==== ПЛОХО ОБУСЛОВЛЕННАЯ КВАДРАТИЧНАЯ ФОРМА ====
+
+def ill_conditioned_quadratic(n: int,
+                              cond: float = 1e3,
+                              spectrum: Optional[np.ndarray] = None,
+                              rotate: bool = False,
+                              seed: int = 0) -> BenchmarkFunction:
+    """
+    Квадратичная форма f(x) = ½ xᵀ A x с заданным спектром A.
+
+    Args:
+        n: Размерность.
+        cond: Число обусловленности; собственные значения распределены
+            логарифмически равномерно на [1, cond] (если spectrum не задан).
+        spectrum: Явно заданные собственные значения (n штук, > 0).
+        rotate: Если True, A = Q diag(λ) Qᵀ со случайной ортогональной Q
+            (плотная матрица, O(n²) памяти); иначе A диагональна.
+        seed: Зерно генератора для матрицы поворота.
+
+    Returns:
+        BenchmarkFunction с минимумом f* = 0 в нуле.
+    """
+    eigenvalues = np.logspace(0, np.log10(cond), n) if spectrum is None else np.asarray(spectrum, dtype=float)
+    if eigenvalues.shape != (n,):
+        raise ValueError(f"Spectrum must have shape ({n},), got {eigenvalues.shape}")
+
+    if rotate:
+        rng = np.random.default_rng(seed)
+        Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+        A = (Q * eigenvalues) @ Q.T
+        A = (A + A.T) / 2
+
+        def f(x):
+            return 0.5 * np.sum((x @ A) * x, axis=-1)
+
+        def grad(x):
+            return x @ A
+
+        def hess(x):
+            return np.broadcast_to(A, np.shape(x) + (n,)).copy()
+
+        def hessp(x, v):
+            return v @ A
+    else:
+        def f(x):
+            return 0.5 * np.sum(eigenvalues * x ** 2, axis=-1)
+
+        def grad(x):
+            return eigenvalues * x
+
+        def hess(x):
+            H = np.zeros(np.shape(x) + (n,))
+            idx = np.arange(n)
+            H[..., idx, idx] = eigenvalues
+            return H
+
+        def hessp(x, v):
+            return eigenvalues * v
+
+    name = f"quadratic_cond_{cond:g}_{n}d" + ("_rotated" if rotate else "")
+    return BenchmarkFunction(
+        name=name,
+        n=n,
+        f=vectorized(_set_name(f, name)),
+        grad=vectorized(_set_name(grad, f"grad_{name}")),
+        hess=vectorized(_set_name(hess, f"hess_{name}")),
+        hessp=vectorized(_set_name(hessp, f"hessp_{name}")),
+        f_star=0.0,
+        hess_sparsity=None if rotate else banded_pattern(n, 0),
+    )
+
+
+# ==== СУММЫ ДВУМЕРНЫХ ФУНКЦИЙ ПО ПАРАМ КООРДИНАТ ====
+
+def _pairwise_sum(name: str, n: int,
+                  f2: Callable, grad2: Callable, hess2: Callable,
+                  f_star: Optional[float]) -> BenchmarkFunction:
+    """
+    Строит f(x) = Σ_i f2(x_{2i}, x_{2i+1}) из векторизованной двумерной функции.
+    Гессиан такой суммы блочно-диагональный с блоками 2×2.
+    """
+    if n < 2 or n % 2:
+        raise ValueError(f"{name} requires an even n >= 2, got {n}")
+    pair_idx = np.arange(n // 2)
+
+    def _pairs(x):
+        return x.reshape(np.shape(x)[:-1] + (n // 2, 2))
+
+    def f(x):
+        return np.sum(f2(_pairs(x)), axis=-1)
+
+    def grad(x):
+        return grad2(_pairs(x)).reshape(np.shape(x))
+
+    def hess(x):
+        blocks = hess2(_pairs(x))
+        H = np.zeros(np.shape(x) + (n,))
+        for a in range(2):
+            for b in range(2):
+                H[..., 2 * pair_idx + a, 2 * pair_idx + b] = blocks[..., a, b]
+        return H
+
+    def hessp(x, v):
+        blocks = hess2(_pairs(x))
+        return np.einsum('...ij,...j->...i', blocks, _pairs(v)).reshape(np.shape(x))
+
+    full_name = f"{name}_{n}d"
+    return BenchmarkFunction(
+        name=full_name,
+        n=n,
+        f=vectorized(_set_name(f, full_name)),
+        grad=vectorized(_set_name(grad, f"grad_{full_name}")),
+        hess=vectorized(_set_name(hess, f"hess_{full_name}")),
+        hessp=vectorized(_set_name(hessp, f"hessp_{full_name}")),
+        f_star=f_star,
+        hess_sparsity=block_diagonal_pattern(n, 2),
+    )
+
+
+def himmelblau_sum(n: int) -> BenchmarkFunction:
+    """
+    Сумма функций Химмельблау по парам координат:
+    f(x) = Σ_i [(x_{2i}² + x_{2i+1} - 11)² + (x_{2i} + x_{2i+1}² - 7)²].
+
+    Минимум f* = 0 достигается в 4^(n/2) точках.
+    """
+    return _pairwise_sum("himmelblau_sum", n, himmelblau_function, himmelblau_grad, himmelblau_hessian, 0.0)
+
+
+def sincos_sum(n: int) -> BenchmarkFunction:
+    """
+    Многомерный аналог sincos_landscape:
+    f(x) = Σ_i sin(x_{2i}) cos(x_{2i+1}) + 0.1 ‖x‖².
+    """
+    return _pairwise_sum("sincos_sum", n, sincos_landscape, grad_sincos_landscape, sincos_hessian, None)
+
+
+ND_BENCHMARKS = {
+    "extended_rosenbrock": extended_rosenbrock,
+    "ill_conditioned_quadratic": ill_conditioned_quadratic,
+    "himmelblau_sum": himmelblau_sum,
+    "sincos_sum": sincos_sum,
+}
@@ -1,21 +1,57 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 
 import numpy as np
 
-from utils.types import ScalarFunction, InitialPoint, HistoryDict, GradientFunction, HessianFunction
-from utils.utils import create_numerical_gradient, FunctionCounter
+from utils.finite_differences import approx_hessian_from_gradient, approx_hessp
+from utils.types import ScalarFunction, InitialPoint, HistoryDict, GradientFunction, HessianFunction, ValueAndGradFunction
+from utils.sparse_differences import create_sparse_hessian
+from utils.trajectory import TrajectoryBuffer, TrajectoryWriter
+from utils.utils import create_numerical_gradient, create_numerical_hessian, FunctionCounter, EvaluationCache
 
 
 @dataclass
 class OptimizationResult:
+    """
+    Результат оптимизации.
+
+    *_call_count — число запросов к функции/градиенту/гессиану, *_unique_count —
+    число реальных вычислений (запросы в уже вычисленных точках берутся из кэша).
+    value_and_grad_call_count — число совмещённых вычислений (f, ∇f); они не
+    входят в function_call_count и gradient_call_count.
+    hessp_call_count — число произведений гессиана на вектор; при разностном
+    hessp каждое стоит одного вычисления градиента, не учтённого в
+    gradient_call_count.
+    hessian_strategy — способ получения гессиана (см. HESSIAN_STRATEGIES),
+    hessian_fd_call_count — сколько вычислений градиента (или функции для
+    'function_differences') потрачено на разностные гессианы; они не входят
+    в gradient_call_count и function_call_count.
+    """
     x: np.ndarray
     iterations: int
-    history: Dict[str, List]
+    history: HistoryDict
     function_call_count: int
     gradient_call_count: int
     hessian_call_count: int
+    function_unique_count: int = 0
+    gradient_unique_count: int = 0
+    hessian_unique_count: int = 0
+    cache_hits: int = 0
+    value_and_grad_call_count: int = 0
+    hessp_call_count: int = 0
+    hessian_strategy: Optional[str] = None
+    hessian_fd_call_count: int = 0
+
+
+# Способы получения гессиана, если он не передан явно:
+#     'analytic'                    — переданная функция hess;
+#     'sparse_gradient_differences' — раскрашенные разности градиента по
+#                                     шаблону hess_sparsity (n_colors + 1 вызов);
+#     'gradient_differences'        — разности аналитического градиента (n вызовов);
+#     'function_differences'        — разностная схема по значениям функции
+#                                     (2n² + 1 вызов), если градиент тоже численный.
+HESSIAN_STRATEGIES = ("analytic", "sparse_gradient_differences", "gradient_differences", "function_differences")
 
 
 class AbstractOptimizer(ABC):
@@ -28,32 +64,150 @@ class AbstractOptimizer(ABC):
         max_iter: Максимальное число итераций.
         verbose: Вывод подробной информации.
         params: дополнительные параметры, переданные через kwargs.
+        cache_size: размер общего LRU-кэша вычислений (0 — без кэша).
+        cache_bytes: предельный объём кэша в байтах (по умолчанию 64 МБ).
+        history_stride: шаг записи траектории (1 — каждая итерация, k — каждая
+            k-я, 0 — только начальная и конечная точки), см. TrajectoryBuffer.
+        history_path: если задан, траектория не хранится в памяти, а потоково
+            пишется в этот каталог (см. TrajectoryWriter, load_trajectory).
+        callback: функция callback(k, x, f), вызываемая после каждой итерации k
+            с новой точкой x и f(x); если она возвращает True, оптимизация
+            останавливается. Исключение из callback прерывает оптимизацию.
+        hessp: произведение гессиана на вектор (x, v) -> ∇²f(x)·v; если не
+            задано, counted_hessp использует прямую разность градиента
+            (см. approx_hessp).
+
+    Если задан value_and_grad (x -> (f(x), ∇f(x))), оптимизаторы получают обе
+    величины одним вызовом через value_and_gradient; результат попадает в кэш
+    функции и градиента.
+
+    Если гессиан не задан, он вычисляется конечными разностями (см.
+    HESSIAN_STRATEGIES): при заданном шаблоне разреженности hess_sparsity —
+    раскрашенными разностями градиента (scipy.sparse-матрица), при
+    аналитическом градиенте — его разностями, иначе — по значениям функции.
+    Схему можно задать через kwargs hessian_fd_method (по умолчанию 'forward'
+    для разностей градиента и 'central' для разностей функции).
     """
 
-    def __init__(self, name: str, fun: ScalarFunction, x0: InitialPoint, gradient: GradientFunction = None, hess: HessianFunction = None,  **kwargs: Any) -> None:
+    def __init__(self, name: str, fun: ScalarFunction, x0: InitialPoint, gradient: GradientFunction = None, hess: HessianFunction = None,
+                 value_and_grad: ValueAndGradFunction = None, **kwargs: Any) -> None:
         self.name = name
         self.tol = kwargs.get("tol", 1e-6)
         self.max_iter = kwargs.get("max_iter", 1500)
         self.verbose = kwargs.get("verbose", False)
         self.fun = fun
         self.x0 = x0
+        self.history_stride = kwargs.get("history_stride", 1)
+        self.history_path = kwargs.get("history_path")
+        self._history = None
+        self.callback = kwargs.get("callback")
 
         self.gradient = gradient if gradient else create_numerical_gradient(self.fun)
-        self.hessian = hess if hess else create_numerical_gradient(self.fun)
+        fd_method = kwargs.get("hessian_fd_method")
+        self.hessian_fd_counter = None
+        if hess:
+            self.hessian_strategy = "analytic"
+            self.hessian = hess
+        elif kwargs.get("hess_sparsity") is not None:
+            self.hessian_strategy = "sparse_gradient_differences"
+            self.hessian_fd_counter = FunctionCounter(self.gradient)
+            self.hessian = create_sparse_hessian(self.hessian_fd_counter, kwargs["hess_sparsity"],
+                                                 method=fd_method or "forward")
+        elif gradient:
+            self.hessian_strategy = "gradient_differences"
+            self.hessian_fd_counter = FunctionCounter(self.gradient)
+            self.hessian_fd_method = fd_method or "forward"
+            self.hessian = self.gradient_difference_hessian
+        else:
+            self.hessian_strategy = "function_differences"
+            self.hessian_fd_counter = FunctionCounter(self.fun)
+            self.hessian = create_numerical_hessian(self.hessian_fd_counter, method=fd_method or "central")
+
+        cache_size = kwargs.get("cache_size", 256)
+        self.cache = EvaluationCache(cache_size, kwargs.get("cache_bytes", 64 * 2**20)) if cache_size else None
+
+        self.counted_function = FunctionCounter(self.fun, self.cache, "f")
+        self.counted_gradient = FunctionCounter(self.gradient, self.cache, "grad")
+        self.counted_hessian = FunctionCounter(self.hessian, self.cache, "hess")
+        self.counted_value_and_grad = FunctionCounter(value_and_grad) if value_and_grad else None
+        self.hessp = kwargs.get("hessp") or self.finite_difference_hessp
+        self._hessp_base = None
+        self.counted_hessp = FunctionCounter(self.hessp)
+
+    def value_and_gradient(self, x: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Возвращает (f(x), ∇f(x)).
+
+        Без value_and_grad — два отдельных вызова. Иначе, если обе величины уже
+        есть в кэше, они берутся оттуда, а в противном случае делается один
+        совмещённый вызов, результат которого сохраняется в кэш.
+        """
+        if self.counted_value_and_grad is None or (
+                self.cache is not None and ("f", x) in self.cache and ("grad", x) in self.cache):
+            return self.counted_function(x), self.counted_gradient(x)
+
+        fx, gx = self.counted_value_and_grad(x)
+        if self.cache is not None:
+            self.cache.put("f", x, fx)
+            gx = self.cache.put("grad", x, gx)
+        return fx, gx
+
+    def gradient_difference_hessian(self, x: np.ndarray) -> np.ndarray:
+        """Гессиан по разностям аналитического градиента; ∇f(x) берётся из кэша."""
+        grad0 = self.counted_gradient(x) if self.hessian_fd_method == "forward" else None
+        return approx_hessian_from_gradient(self.hessian_fd_counter, x, self.hessian_fd_method, grad0=grad0)
+
+    def finite_difference_hessp(self, x: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        ∇²f(x)·v по прямой разности градиента. ∇f(x) запрашивается один раз
+        на точку x (внутри решения CG точка не меняется).
+        """
+        if self._hessp_base is None or not np.array_equal(self._hessp_base[0], x):
+            self._hessp_base = (np.array(x, dtype=float), self.counted_gradient(x))
+        return approx_hessp(self.gradient, x, v, grad0=self._hessp_base[1])
+
+    def start_history(self, x: np.ndarray, fx: float) -> HistoryDict:
+        """Создаёт хранилище траектории и записывает в него начальную точку."""
+        if self.history_path is not None:
+            history = TrajectoryWriter(self.history_path, np.size(x), stride=self.history_stride)
+        else:
+            history = TrajectoryBuffer(np.size(x), capacity=min(self.max_iter + 1, 1024), stride=self.history_stride)
+        history.append(x, fx)
+        self._history = history
+        return history
 
-        self.counted_function = FunctionCounter(self.fun)
-        self.counted_gradient = FunctionCounter(self.gradient)
-        self.counted_hessian = FunctionCounter(self.hessian)
+    def should_stop(self, k: int, x: np.ndarray, fx: float) -> bool:
+        """Передаёт итерацию k в callback; True — callback просит остановиться."""
+        return self.callback is not None and bool(self.callback(k, x, fx))
 
     def run(self) -> OptimizationResult:
-        x, history = self.optimize()
+        self._history = None
+        try:
+            x, history = self.optimize()
+        finally:
+            # Траектория закрывается и при исключении в optimize(): файлы
+            # TrajectoryWriter не остаются открытыми, а meta.json — недописанным.
+            if self._history is not None:
+                self._history.close()
+        if isinstance(history, (TrajectoryBuffer, TrajectoryWriter)):
+            iterations = history.close().total
+        else:
+            iterations = len(history['x'])
         return OptimizationResult(
             x=x,
-            iterations=len(history['x']),
+            iterations=iterations,
             history=history,
             function_call_count=self.counted_function.get_count(),
             gradient_call_count=self.counted_gradient.get_count(),
-            hessian_call_count=self.counted_hessian.get_count())
+            hessian_call_count=self.counted_hessian.get_count(),
+            function_unique_count=self.counted_function.get_unique_count(),
+            gradient_unique_count=self.counted_gradient.get_unique_count(),
+            hessian_unique_count=self.counted_hessian.get_unique_count(),
+            cache_hits=sum(self.cache.hits.values()) if self.cache else 0,
+            value_and_grad_call_count=self.counted_value_and_grad.get_count() if self.counted_value_and_grad else 0,
+            hessp_call_count=self.counted_hessp.get_count(),
+            hessian_strategy=self.hessian_strategy,
+            hessian_fd_call_count=self.hessian_fd_counter.get_count() if self.hessian_fd_counter else 0)
 
     @abstractmethod
     def optimize(self) -> Tuple[np.ndarray, HistoryDict]:
@@ -6,6 +6,9 @@ from scipy.optimize import minimize
 from methods.abstractions.abstract_optimizator import AbstractOptimizer
 from utils.types import ScalarFunction, HistoryDict, InitialPoint, GradientFunction, HessianFunction
 
+# Методы SciPy, не использующие производные: им передаётся только функция.
+DERIVATIVE_FREE_METHODS = ("nelder-mead", "powell", "cobyla", "cobyqa")
+
 
 class SciPyAbstractOptimizer(AbstractOptimizer):
     """
@@ -25,17 +28,26 @@ class SciPyAbstractOptimizer(AbstractOptimizer):
         self.method_name = method_name
 
     def optimize(self) -> Tuple[np.ndarray, HistoryDict]:
-        history: HistoryDict = {'x': [self.x0.copy()], 'f': [self.fun(self.x0)]}
+        history = self.start_history(self.x0, self.counted_function(self.x0))
 
         def callback(xk):
-            history['x'].append(xk.copy())
-            history['f'].append(self.fun(xk))
+            fk = self.counted_function(xk)
+            history.append(xk, fk)
+            if self.should_stop(history.total - 2, xk, fk):
+                raise StopIteration
 
             return callback
 
-        result = minimize(self.counted_function,
+        if self.method_name.lower() in DERIVATIVE_FREE_METHODS:
+            result = minimize(self.counted_function, self.x0, method=self.method_name, callback=callback,
+                              options={"maxiter": self.max_iter, "disp": self.verbose})
+            return result.x, history
+
+        # С value_and_grad SciPy получает (f, ∇f) одним вызовом (jac=True).
+        fused = self.counted_value_and_grad is not None
+        result = minimize(self.value_and_gradient if fused else self.counted_function,
                           self.x0,
-                          jac=self.counted_gradient,
+                          jac=True if fused else self.counted_gradient,
                           hess=self.counted_hessian,
                           method=self.method_name,
                           callback=callback,
@@ -1,13 +1,101 @@
+from typing import Callable, Optional, Tuple
+
 import numpy as np
 
+from utils.batch import evaluate_batch
 from utils.utils import FunctionCounter
 
+# Все методы одномерного поиска имеют сигнатуру (f, x, d, **params) -> α.
+# Помимо гиперпараметров оптимизатора в params передаются уже известные
+# величины: grad (∇f(x)), f_x (f(x)) и grad_f (счётчик градиента).
+# Методы, которым они не нужны, их игнорируют. Оптимизаторы также передают
+# alpha_prev — шаг, принятый на предыдущей итерации (см. bracket_minimum),
+# и value_and_grad_f — совмещённое вычисление x -> (f(x), ∇f(x)).
+
+# Максимум делений шага пополам в запасном поиске strong_wolfe_line_search.
+_ARMIJO_FALLBACK_HALVINGS = 30
+
+
+def bracket_minimum(phi: Callable[[float], float],
+                    alpha0: float = 1.0,
+                    phi0: float = None,
+                    grow: float = 2.0,
+                    max_iter: int = 50,
+                    min_step: float = 1e-12) -> Optional[Tuple[float, float]]:
+    """
+    Находит отрезок [left, right], содержащий минимум φ(α) при α > 0.
+
+    Поиск начинается с пробного шага alpha0 (обычно — шага, принятого на
+    предыдущей итерации) и геометрически расширяется, пока φ убывает, либо
+    сужается, пока не будет найдено α с φ(α) < φ(0). Внутри найденного
+    отрезка всегда есть точка, в которой φ меньше, чем на обоих концах.
+    Если убывания не найдено (d — не направление спуска), возвращается None.
+
+    Args:
+        phi: Функция φ(α) = f(x + α*d).
+        alpha0: Начальный пробный шаг.
+        phi0: Уже известное значение φ(0).
+        grow: Множитель расширения/сужения.
+        max_iter: Максимальное число расширений или сужений.
+        min_step: Минимальный шаг, после которого сужение прекращается.
+
+    Returns:
+        Optional[Tuple[float, float]]: Границы отрезка (left, right) или None.
+    """
+    if phi0 is None:
+        phi0 = phi(0.0)
+    alpha = alpha0
+    phi_alpha = phi(alpha)
+
+    if phi_alpha < phi0:
+        prev = 0.0
+        for _ in range(max_iter):
+            nxt = alpha * grow
+            phi_next = phi(nxt)
+            if not phi_next < phi_alpha:
+                return prev, nxt
+            prev, alpha, phi_alpha = alpha, nxt, phi_next
+        return prev, alpha
+
+    for _ in range(max_iter):
+        nxt = alpha / grow
+        if nxt < min_step:
+            break
+        if phi(nxt) < phi0:
+            return 0.0, alpha
+        alpha = nxt
+    return None
+
+
+def _search_interval(phi: Callable[[float], float], params: dict) -> Tuple[float, float, Callable[[float, float], float]]:
+    """
+    Определяет начальный отрезок и точность одномерного поиска.
+
+    Если границы linear_left/linear_right заданы, используется этот отрезок и
+    абсолютная точность tol. Иначе отрезок строится bracket_minimum от шага
+    alpha_prev, а поиск останавливается при относительной точности linear_rtol
+    (по умолчанию 1e-4) — на поздних итерациях, когда шаги малы, это требует
+    заметно меньше вычислений, чем сужение фиксированного окна до tol.
+    Если построить отрезок не удалось, используется окно [0, 5].
+    """
+    tol = params.get('tol', 1e-9)
+    if 'linear_left' in params or 'linear_right' in params:
+        rtol = params.get('linear_rtol', 0.0)
+        left, right = params.get('linear_left', 0), params.get('linear_right', 5)
+    else:
+        rtol = params.get('linear_rtol', 1e-4)
+        bracket = bracket_minimum(phi, params.get('alpha_prev') or 1.0, params.get('f_x'))
+        left, right = bracket if bracket is not None else (0, 5)
+    return left, right, lambda l, r: max(tol, rtol * (l + r) / 2)
+
+
 def ternary_search_line(f: FunctionCounter, x: np.ndarray, d: np.ndarray, **params):
     """
     Одномерный поиск методом тернарного разбиения для минимизации функции
     φ(α) = f(x + α*d).
 
-    Если границы не заданы, определяется интервал с помощью bracket_minimum.
+    Если границы linear_left/linear_right не заданы, интервал определяется
+    с помощью bracket_minimum от шага предыдущей итерации (alpha_prev).
 
     Args:
         f: Функция f: ℝⁿ → ℝ.
@@ -18,12 +106,9 @@ def ternary_search_line(f: FunctionCounter, x: np.ndarray, d: np.ndarray, **para
         float: Оптимальное значение шага α.
     """
 
-    left = params.get('linear_left', 0)
-    right = params.get('linear_right', 5)
-    tol = params.get('tol', 1e-9)
-
     phi = lambda alpha: f(x + alpha * d)
-    while right - left > tol:
+    left, right, tol = _search_interval(phi, params)
+    while right - left > tol(left, right):
         m1 = left + (right - left) / 3
         m2 = right - (right - left) / 3
         if phi(m1) < phi(m2):
@@ -39,7 +124,8 @@ def golden_section_line_search(f: FunctionCounter, x: np.ndarray, d: np.ndarray,
     Одномерный поиск методом золотого сечения для минимизации функции
     φ(α) = f(x + α*d).
 
-    Если границы не заданы, определяется интервал с помощью bracket_minimum.
+    Если границы linear_left/linear_right не заданы, интервал определяется
+    с помощью bracket_minimum от шага предыдущей итерации (alpha_prev).
 
     Args:
         f: Функция f: ℝⁿ → ℝ.
@@ -50,16 +136,13 @@ def golden_section_line_search(f: FunctionCounter, x: np.ndarray, d: np.ndarray,
         float: Оптимальное значение шага α.
     """
 
-    left = params.get('linear_left', 0)
-    right = params.get('linear_right', 5)
-    tol = params.get('tol', 1e-9)
-
     phi = lambda alpha: f(x + alpha * d)
+    left, right, tol = _search_interval(phi, params)
     invphi = (np.sqrt(5) - 1) / 2
     m1 = left + (1 - invphi) * (right - left)
     m2 = left + invphi * (right - left)
     f1, f2 = phi(m1), phi(m2)
-    while right - left > tol:
+    while right - left > tol(left, right):
         if f1 < f2:
             right = m2
             m2 = m1
@@ -74,3 +157,191 @@ def golden_section_line_search(f: FunctionCounter, x: np.ndarray, d: np.ndarray,
             f2 = phi(m2)
     alpha_opt = (left + right) / 2
     return alpha_opt
+
+
+def k_section_line_search(f: FunctionCounter, x: np.ndarray, d: np.ndarray, **params) -> float:
+    """
+    Одномерный поиск k-секциями для минимизации функции φ(α) = f(x + α*d).
+
+    На каждом раунде в отрезке берутся k равноотстоящих внутренних точек,
+    все они вычисляются одновременно, и отрезок сужается до соседей лучшей
+    точки, т.е. в (k+1)/2 раз. По сравнению с золотым сечением вычислений
+    больше, но последовательных раундов — в log((k+1)/2) / log(1.618) раз меньше,
+    что сокращает задержку, когда каждый вызов f — долгая симуляция.
+
+    Точки раунда вычисляются одним пакетным вызовом f на массиве
+    x + alphas[:, None] * d (если f векторизована), либо через executor.map.
+    Границы и точность определяются так же, как в golden_section_line_search.
+
+    Args:
+        f: Функция f: ℝⁿ → ℝ.
+        x: Текущая точка (np.ndarray).
+        d: Направление поиска.
+        **params:
+            k_section: Число точек на раунд (k >= 2, по умолчанию 4).
+            executor: concurrent.futures.Executor для параллельного вычисления
+                точек раунда. В пуле вычисляется исходная функция f.func (без
+                счётчика и кэша, которые не потокобезопасны), а счётчики
+                FunctionCounter увеличиваются на размер раунда в вызывающем
+                потоке. Для пула процессов f.func должна сериализоваться pickle.
+
+    Returns:
+        float: Оптимальное значение шага α.
+    """
+    k = params.get('k_section', 4)
+    if k < 2:
+        raise ValueError(f"k_section must be at least 2, got {k}")
+    executor = params.get('executor')
+    raw_f = f.func if isinstance(f, FunctionCounter) else f
+
+    def phi_many(alphas: np.ndarray) -> np.ndarray:
+        points = x + alphas[:, None] * d
+        if executor is None:
+            return evaluate_batch(f, points)
+        values = np.fromiter(executor.map(raw_f, points), dtype=float, count=len(alphas))
+        if isinstance(f, FunctionCounter):
+            f.count += len(alphas)
+            f.unique_count += len(alphas)
+        return values
+
+    phi = lambda alpha: f(x + alpha * d)
+    left, right, tol = _search_interval(phi, params)
+    while right - left > tol(left, right):
+        grid = np.linspace(left, right, k + 2)
+        best = np.argmin(phi_many(grid[1:-1])) + 1
+        left, right = grid[best - 1], grid[best + 1]
+    alpha_opt = (left + right) / 2
+    return alpha_opt
+
+
+def _cubic_interpolate(a: float, phi_a: float, dphi_a: float,
+                       b: float, phi_b: float, dphi_b: float) -> float:
+    """
+    Минимум кубического интерполянта по значениям и производным φ в точках a и b
+    (Nocedal & Wright, формула 3.59). При вырождении используется квадратичная
+    интерполяция по φ(a), φ'(a), φ(b), а в крайнем случае — середина отрезка.
+    Результат отодвигается от концов отрезка не менее чем на 0.1 его длины,
+    чтобы zoom гарантированно сужал интервал.
+    """
+    lo, hi = min(a, b), max(a, b)
+    margin = 0.1 * (hi - lo)
+
+    def safeguard(alpha):
+        return min(max(alpha, lo + margin), hi - margin)
+
+    d1 = dphi_a + dphi_b - 3 * (phi_a - phi_b) / (a - b)
+    radicand = d1 * d1 - dphi_a * dphi_b
+    if radicand >= 0:
+        d2 = np.sign(b - a) * np.sqrt(radicand)
+        denom = dphi_b - dphi_a + 2 * d2
+        if denom != 0:
+            alpha = b - (b - a) * (dphi_b + d2 - d1) / denom
+            if np.isfinite(alpha):
+                return safeguard(alpha)
+
+    denom = 2 * (phi_b - phi_a - dphi_a * (b - a))
+    if denom != 0:
+        alpha = a - dphi_a * (b - a) ** 2 / denom
+        if np.isfinite(alpha):
+            return safeguard(alpha)
+    return (a + b) / 2
+
+
+def strong_wolfe_line_search(f: FunctionCounter, x: np.ndarray, d: np.ndarray, **params) -> float:
+    """
+    Одномерный поиск, удовлетворяющий сильным условиям Вольфе
+    (Nocedal & Wright, алгоритмы 3.5 и 3.6, zoom с кубической интерполяцией):
+
+        φ(α) ≤ φ(0) + c1 α φ'(0),
+        |φ'(α)| ≤ c2 |φ'(0)|,     где φ(α) = f(x + α*d).
+
+    Производная φ'(α) = ∇f(x + α*d)·d вычисляется через градиент, поэтому
+    обычно шаг принимается за 1–3 вычисления. Уже известные φ(0) и ∇f(x)
+    передаются вызывающим оптимизатором и повторно не вычисляются.
+
+    Args:
+        f: Функция f: ℝⁿ → ℝ.
+        x: Текущая точка (np.ndarray).
+        d: Направление спуска.
+        **params:
+            grad_f: Градиент ∇f (обязателен).
+            value_and_grad_f: Совмещённое вычисление (f, ∇f); если задано,
+                φ(α) и φ'(α) получаются одним вызовом.
+            grad: Градиент в точке x (если уже известен).
+            f_x: Значение f(x) (если уже известно).
+            c1, c2: Константы условий Вольфе (по умолчанию 1e-4 и 0.9).
+            alpha_init: Начальный шаг (по умолчанию 1).
+            alpha_max: Максимальный шаг (по умолчанию 50).
+            wolfe_max_iter: Максимум итераций расширения и сужения (по умолчанию 20).
+
+    Returns:
+        float: Шаг α (0, если d не является направлением спуска).
+    """
+    grad_f = params.get('grad_f')
+    if grad_f is None:
+        raise ValueError("strong_wolfe_line_search requires the gradient callable 'grad_f'")
+    c1 = params.get('c1', 1e-4)
+    c2 = params.get('c2', 0.9)
+    alpha_max = params.get('alpha_max', 50.0)
+    max_iter = params.get('wolfe_max_iter', 20)
+
+    phi0 = params.get('f_x')
+    if phi0 is None:
+        phi0 = f(x)
+    g0 = params.get('grad')
+    if g0 is None:
+        g0 = grad_f(x)
+    dphi0 = np.dot(g0, d)
+    if dphi0 >= 0:
+        return 0.0
+
+    value_and_grad_f = params.get('value_and_grad_f')
+
+    def phi_dphi(alpha):
+        point = x + alpha * d
+        if value_and_grad_f is not None:
+            phi_a, g_a = value_and_grad_f(point)
+            return phi_a, np.dot(g_a, d)
+        return f(point), np.dot(grad_f(point), d)
+
+    def armijo_fails(alpha, phi_alpha):
+        return not np.isfinite(phi_alpha) or phi_alpha > phi0 + c1 * alpha * dphi0
+
+    def zoom(lo, phi_lo, dphi_lo, hi, phi_hi, dphi_hi):
+        for _ in range(max_iter):
+            alpha = _cubic_interpolate(lo, phi_lo, dphi_lo, hi, phi_hi, dphi_hi)
+            phi_a, dphi_a = phi_dphi(alpha)
+            if armijo_fails(alpha, phi_a) or phi_a >= phi_lo:
+                hi, phi_hi, dphi_hi = alpha, phi_a, dphi_a
+            else:
+                if abs(dphi_a) <= -c2 * dphi0:
+                    return alpha
+                if dphi_a * (hi - lo) >= 0:
+                    hi, phi_hi, dphi_hi = lo, phi_lo, dphi_lo
+                lo, phi_lo, dphi_lo = alpha, phi_a, dphi_a
+        if lo > 0:
+            return lo
+        # Ни одна точка интервала не прошла условие Армихо: вместо нулевого
+        # шага уменьшаем hi вдвое, пока условие Армихо не выполнится.
+        alpha = hi
+        for _ in range(_ARMIJO_FALLBACK_HALVINGS):
+            if not armijo_fails(alpha, f(x + alpha * d)):
+                break
+            alpha /= 2
+        return alpha
+
+    alpha_prev, phi_prev, dphi_prev = 0.0, phi0, dphi0
+    alpha = min(params.get('alpha_init', 1.0), alpha_max)
+    for i in range(max_iter):
+        phi_a, dphi_a = phi_dphi(alpha)
+        if armijo_fails(alpha, phi_a) or (i > 0 and phi_a >= phi_prev):
+            return zoom(alpha_prev, phi_prev, dphi_prev, alpha, phi_a, dphi_a)
+        if abs(dphi_a) <= -c2 * dphi0:
+            return alpha
+        if dphi_a >= 0:
+            return zoom(alpha, phi_a, dphi_a, alpha_prev, phi_prev, dphi_prev)
+        if alpha >= alpha_max:
+            return alpha
+        alpha_prev, phi_prev, dphi_prev = alpha, phi_a, dphi_a
+        alpha = min(2 * alpha, alpha_max)
+    return alpha_prev
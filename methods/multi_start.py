@@ -0,0 +1,372 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from methods.linear_search import golden_section_line_search, ternary_search_line
+from methods.newton.custom_bfgs import CustomBfgs, backtracking_line_search
+from methods.scheduled_gradient_descent.scheduled_gradient_descent import (CustomScheduledGradientDescent,
+                                                                          update_learning_rate)
+from methods.steepest_gradient_descent.steepest_gradient_descent import CustomGradientDescentOptimizer
+from utils.batch import evaluate_batch
+from utils.types import GradientFunction, ScalarFunction
+from utils.utils import FunctionCounter, create_numerical_gradient
+
+# Мультистарт «в ногу»: K начальных точек хранятся одним массивом (K, n), и на
+# каждой итерации функция и градиент вычисляются одним пакетным вызовом на всех
+# ещё активных строках (если они векторизованы, см. utils.batch). Шаг у каждой
+# строки свой; сошедшиеся строки выбывают независимо от остальных.
+#
+# Арифметика повторяет соответствующие оптимизаторы, поэтому строка проходит
+# ту же траекторию, что и отдельный запуск из той же точки.
+
+_INVPHI = (np.sqrt(5) - 1) / 2
+
+
+@dataclass
+class MultiStartResult:
+    """
+    Результат мультистарта.
+
+    Атрибуты:
+        x: конечные точки, форма (K, n).
+        f: значения функции в них, форма (K,).
+        iterations: число выполненных шагов для каждой строки.
+        converged: достигнута ли для строки норма градиента < tol.
+        stopped: остановлена ли строка callback'ом.
+        function_call_count, gradient_call_count: суммарное число вычисленных
+            точек (пакет из m точек учитывается как m вычислений).
+    """
+    x: np.ndarray
+    f: np.ndarray
+    iterations: np.ndarray
+    converged: np.ndarray
+    stopped: np.ndarray
+    function_call_count: int
+    gradient_call_count: int
+
+    def best(self) -> Tuple[np.ndarray, float]:
+        """Лучшая найденная точка и значение функции в ней (NaN игнорируются)."""
+        i = int(np.nanargmin(self.f))
+        return self.x[i], float(self.f[i])
+
+
+def batch_bracket_minimum(phi: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                          alpha0: np.ndarray,
+                          phi0: np.ndarray,
+                          grow: float = 2.0,
+                          max_iter: int = 50,
+                          min_step: float = 1e-12) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Пакетный вариант linear_search.bracket_minimum: отрезки [left, right] для
+    всех строк сразу. Строки, для которых убывание не найдено, получают окно
+    [0, 5], как в _search_interval.
+
+    Args:
+        phi: phi(alphas, rows) -> значения φ_row(α) для строк rows.
+        alpha0: Начальные пробные шаги (m,).
+        phi0: Значения φ(0) (m,).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: границы left и right (m,).
+    """
+    m = len(alpha0)
+    alpha = np.array(alpha0, dtype=float)
+    phi_alpha = phi(alpha, np.arange(m))
+    left, right = np.zeros(m), np.full(m, 5.0)
+
+    decreasing = phi_alpha < phi0
+    rows = np.flatnonzero(decreasing)
+    prev = np.zeros(m)
+    for _ in range(max_iter):
+        if not rows.size:
+            break
+        nxt = alpha[rows] * grow
+        phi_next = phi(nxt, rows)
+        grew = phi_next < phi_alpha[rows]
+        done = rows[~grew]
+        left[done], right[done] = prev[done], nxt[~grew]
+        rows, nxt, phi_next = rows[grew], nxt[grew], phi_next[grew]
+        prev[rows], alpha[rows], phi_alpha[rows] = alpha[rows], nxt, phi_next
+    left[rows], right[rows] = prev[rows], alpha[rows]
+
+    rows = np.flatnonzero(~decreasing)
+    for _ in range(max_iter):
+        nxt = alpha[rows] / grow
+        keep = nxt >= min_step
+        rows, nxt = rows[keep], nxt[keep]
+        if not rows.size:
+            break
+        found = phi(nxt, rows) < phi0[rows]
+        done = rows[found]
+        left[done], right[done] = 0.0, alpha[done]
+        rows = rows[~found]
+        alpha[rows] = nxt[~found]
+    return left, right
+
+
+def _batch_search_interval(phi: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                           phi0: np.ndarray,
+                           alpha_prev: np.ndarray,
+                           params: dict) -> Tuple[np.ndarray, np.ndarray, Callable]:
+    """Пакетный вариант linear_search._search_interval."""
+    m = len(phi0)
+    tol = params.get('tol', 1e-9)
+    if 'linear_left' in params or 'linear_right' in params:
+        rtol = params.get('linear_rtol', 0.0)
+        left = np.full(m, float(params.get('linear_left', 0)))
+        right = np.full(m, float(params.get('linear_right', 5)))
+    else:
+        rtol = params.get('linear_rtol', 1e-4)
+        alpha0 = np.where(np.isnan(alpha_prev) | (alpha_prev == 0), 1.0, alpha_prev)
+        left, right = batch_bracket_minimum(phi, alpha0, phi0)
+    return left, right, lambda l, r: np.maximum(tol, rtol * (l + r) / 2)
+
+
+def batch_golden_section_line_search(phi: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                                     phi0: np.ndarray,
+                                     alpha_prev: np.ndarray,
+                                     **params) -> np.ndarray:
+    """
+    Золотое сечение сразу для m строк (см. golden_section_line_search).
+
+    На каждом раунде новые пробные точки всех ещё не сошедшихся строк
+    вычисляются одним вызовом phi(alphas, rows).
+    """
+    m = len(phi0)
+    left, right, tol = _batch_search_interval(phi, phi0, alpha_prev, params)
+    m1 = left + (1 - _INVPHI) * (right - left)
+    m2 = left + _INVPHI * (right - left)
+    both = phi(np.concatenate([m1, m2]), np.concatenate([np.arange(m), np.arange(m)]))
+    f1, f2 = both[:m], both[m:]
+
+    rows = np.flatnonzero(right - left > tol(left, right))
+    while rows.size:
+        better = f1[rows] < f2[rows]
+        a, b = rows[better], rows[~better]
+        right[a], m2[a], f2[a] = m2[a], m1[a], f1[a]
+        m1[a] = left[a] + (1 - _INVPHI) * (right[a] - left[a])
+        left[b], m1[b], f1[b] = m1[b], m2[b], f2[b]
+        m2[b] = left[b] + _INVPHI * (right[b] - left[b])
+        values = phi(np.concatenate([m1[a], m2[b]]), np.concatenate([a, b]))
+        f1[a], f2[b] = values[:a.size], values[a.size:]
+        rows = rows[right[rows] - left[rows] > tol(left[rows], right[rows])]
+    return (left + right) / 2
+
+
+def batch_ternary_search_line(phi: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                              phi0: np.ndarray,
+                              alpha_prev: np.ndarray,
+                              **params) -> np.ndarray:
+    """Тернарный поиск сразу для m строк (см. ternary_search_line)."""
+    left, right, tol = _batch_search_interval(phi, phi0, alpha_prev, params)
+    rows = np.flatnonzero(right - left > tol(left, right))
+    while rows.size:
+        l, r = left[rows], right[rows]
+        m1, m2 = l + (r - l) / 3, r - (r - l) / 3
+        values = phi(np.concatenate([m1, m2]), np.concatenate([rows, rows]))
+        first = values[:rows.size] < values[rows.size:]
+        right[rows[first]] = m2[first]
+        left[rows[~first]] = m1[~first]
+        rows = rows[right[rows] - left[rows] > tol(left[rows], right[rows])]
+    return (left + right) / 2
+
+
+# Одномерные поиски, для которых есть пакетная реализация; остальные методы
+# вызываются для каждой строки по отдельности.
+BATCH_LINE_SEARCHES = {
+    golden_section_line_search: batch_golden_section_line_search,
+    ternary_search_line: batch_ternary_search_line,
+}
+
+
+class MultiStartOptimizer:
+    """
+    Пакетный мультистарт для CustomScheduledGradientDescent,
+    CustomGradientDescentOptimizer и CustomBfgs.
+
+    Все K начальных точек продвигаются одновременно: функция и градиент
+    вычисляются одним вызовом на массиве (m, n) активных строк, шаг (lr,
+    результат одномерного поиска или backtracking) у каждой строки свой.
+    Строка выбывает, когда ‖∇f‖ < tol, когда x становится NaN/Inf или по
+    решению callback. Траектории не сохраняются — только конечные точки.
+
+    Для скорости fun и grad должны быть векторизованы (см. utils.batch);
+    иначе они вызываются в цикле по строкам.
+
+    Атрибуты:
+        optimizer_class: один из поддерживаемых классов оптимизатора.
+        fun, grad: функция и градиент (grad=None — численный градиент).
+        x0s: начальные точки, форма (K, n).
+        callback: callback(k, rows, x, f) после итерации k; rows — индексы
+            активных строк, x и f — их новые точки и значения. Возвращает
+            None/False, True (остановить всё) или булеву маску строк rows,
+            которые нужно остановить.
+        params: гиперпараметры оптимизатора, как в его kwargs (strategy,
+            initial_lr, line_search_method, alpha_init, tau, c, tol, max_iter, ...).
+    """
+
+    SUPPORTED = (CustomScheduledGradientDescent, CustomGradientDescentOptimizer, CustomBfgs)
+
+    def __init__(self, optimizer_class: type, fun: ScalarFunction, x0s: np.ndarray,
+                 grad: GradientFunction = None, **kwargs: Any) -> None:
+        if optimizer_class not in self.SUPPORTED:
+            raise ValueError(f"Unsupported optimizer for multi-start: {optimizer_class.__name__}. "
+                             f"Expected one of {[cls.__name__ for cls in self.SUPPORTED]}")
+        self.optimizer_class = optimizer_class
+        self.x0s = np.atleast_2d(np.asarray(x0s, dtype=float))
+        self.tol = kwargs.get("tol", 1e-6)
+        self.max_iter = kwargs.get("max_iter", 1500)
+        self.verbose = kwargs.get("verbose", False)
+        self.callback = kwargs.get("callback")
+        self.params = kwargs
+
+        self.counted_function = FunctionCounter(fun)
+        self.counted_gradient = FunctionCounter(grad if grad else create_numerical_gradient(fun))
+
+        if optimizer_class is CustomScheduledGradientDescent:
+            self.params = dict(kwargs)
+            self.strategy = self.params.pop("strategy", "constant")
+            self._step = self._scheduled_step
+        elif optimizer_class is CustomGradientDescentOptimizer:
+            self.line_search_method = kwargs.get("line_search_method", ternary_search_line)
+            self._step = self._steepest_step
+        else:
+            self.line_search_method = kwargs.get("line_search_method", backtracking_line_search)
+            self._step = self._bfgs_step
+
+    # ==== Вычисления на пакете строк ====
+
+    def _values(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(evaluate_batch(self.counted_function, X), dtype=float).reshape(len(X))
+
+    def _gradients(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(evaluate_batch(self.counted_gradient, X), dtype=float).reshape(X.shape)
+
+    def _move(self, rows: np.ndarray, X_new: np.ndarray) -> None:
+        """Переводит строки rows в точки X_new и вычисляет в них f и ∇f."""
+        self.X[rows] = X_new
+        finite = np.all(np.isfinite(X_new), axis=1)
+        self.alive[rows[~finite]] = False
+        rows, X_new = rows[finite], X_new[finite]
+        if rows.size:
+            self.F[rows] = self._values(X_new)
+            self.G[rows] = self._gradients(X_new)
+
+    def _line_search_per_row(self, rows: np.ndarray, X: np.ndarray, D: np.ndarray) -> np.ndarray:
+        """Одномерный поиск без пакетной реализации — отдельно для каждой строки."""
+        alpha = np.empty(len(rows))
+        for i, row in enumerate(rows):
+            alpha_prev = self.alpha_prev[row]
+            alpha[i] = self.line_search_method(self.counted_function, X[i], D[i], grad=self.G[row],
+                                               f_x=self.F[row], grad_f=self.counted_gradient,
+                                               alpha_prev=None if np.isnan(alpha_prev) else alpha_prev,
+                                               **self.params)
+        return alpha
+
+    def _backtracking(self, X: np.ndarray, F: np.ndarray, G: np.ndarray, P: np.ndarray) -> np.ndarray:
+        """
+        backtracking_line_search для всех строк: шаг уменьшается только у
+        строк, где ещё не выполнено условие Армихо.
+        """
+        c = self.params.get("c", 1e-4)
+        tau = self.params.get("tau", 0.5)
+        alpha = np.full(len(X), float(self.params.get("alpha_init", 1.0)))
+        slope = np.einsum("ki,ki->k", G, P)
+        pending = np.arange(len(X))
+        while pending.size:
+            trial = self._values(X[pending] + alpha[pending, None] * P[pending])
+            failed = trial > F[pending] + c * alpha[pending] * slope[pending]
+            pending = pending[failed]
+            alpha[pending] *= tau
+            pending = pending[alpha[pending] >= 1e-8]
+        return alpha
+
+    # ==== Шаги методов ====
+
+    def _scheduled_step(self, k: int, rows: np.ndarray) -> None:
+        lr = update_learning_rate(strategy=self.strategy, k=k, **self.params)
+        self._move(rows, self.X[rows] - lr * self.G[rows])
+
+    def _steepest_step(self, k: int, rows: np.ndarray) -> None:
+        X, D = self.X[rows], -self.G[rows]
+        batch_search = BATCH_LINE_SEARCHES.get(self.line_search_method)
+        if batch_search is not None:
+            def phi(alphas: np.ndarray, idx: np.ndarray) -> np.ndarray:
+                return self._values(X[idx] + alphas[:, None] * D[idx])
+
+            alpha = batch_search(phi, self.F[rows], self.alpha_prev[rows], **self.params)
+        else:
+            alpha = self._line_search_per_row(rows, X, D)
+        self.alpha_prev[rows] = alpha
+        self._move(rows, X + alpha[:, None] * D)
+
+    def _bfgs_step(self, k: int, rows: np.ndarray) -> None:
+        X, F, G, H = self.X[rows], self.F[rows], self.G[rows], self.H[rows]
+        P = -np.einsum("kij,kj->ki", H, G)
+        if self.line_search_method is backtracking_line_search:
+            alpha = self._backtracking(X, F, G, P)
+        else:
+            alpha = self._line_search_per_row(rows, X, P)
+
+        S = alpha[:, None] * P
+        self._move(rows, X + S)
+        Y = self.G[rows] - G
+
+        # H ← H + s uᵀ + u sᵀ, u = -ρ H y + ½ (ρ² yᵀHy + ρ) s (см. bfgs_inverse_update).
+        ys = np.einsum("ki,ki->k", Y, S)
+        update = ys > 0
+        rho = 1.0 / ys[update]
+        s, y, Hu = S[update], Y[update], H[update]
+        Hy = np.einsum("kij,kj->ki", Hu, y)
+        u = -rho[:, None] * Hy + (0.5 * (rho * rho * np.einsum("ki,ki->k", y, Hy) + rho))[:, None] * s
+        H[update] = Hu + s[:, :, None] * u[:, None, :] + u[:, :, None] * s[:, None, :]
+        H[~update] = np.eye(X.shape[1])
+        self.H[rows] = H
+
+    # ==== Общий цикл ====
+
+    def run(self) -> MultiStartResult:
+        K, n = self.x0s.shape
+        self.X = self.x0s.copy()
+        self.F = self._values(self.X)
+        self.G = self._gradients(self.X)
+        self.alive = np.ones(K, dtype=bool)
+        self.alpha_prev = np.full(K, np.nan)
+        if self.optimizer_class is CustomBfgs:
+            self.H = np.tile(np.eye(n), (K, 1, 1))
+        iterations = np.zeros(K, dtype=int)
+        converged = np.zeros(K, dtype=bool)
+        stopped = np.zeros(K, dtype=bool)
+
+        for k in range(self.max_iter):
+            rows = np.flatnonzero(self.alive)
+            done = np.linalg.norm(self.G[rows], axis=1) < self.tol
+            converged[rows[done]] = True
+            self.alive[rows[done]] = False
+            rows = rows[~done]
+            if not rows.size:
+                break
+
+            self._step(k, rows)
+            iterations[rows] += 1
+            if self.verbose:
+                print(f"Iter={k:03d}: active={rows.size}, best f={np.nanmin(self.F):.6e}")
+
+            if self.callback is not None:
+                rows = rows[self.alive[rows]]
+                decision = self.callback(k, rows, self.X[rows], self.F[rows])
+                if decision is True:
+                    stopped[rows] = True
+                    self.alive[rows] = False
+                elif decision is not None and decision is not False:
+                    halt = rows[np.asarray(decision, dtype=bool)]
+                    stopped[halt] = True
+                    self.alive[halt] = False
+
+        # Строки, сошедшиеся на последнем шаге, тоже отмечаются.
+        rows = np.flatnonzero(self.alive)
+        converged[rows[np.linalg.norm(self.G[rows], axis=1) < self.tol]] = True
+        return MultiStartResult(x=self.X, f=self.F, iterations=iterations, converged=converged, stopped=stopped,
+                                function_call_count=self.counted_function.get_count(),
+                                gradient_call_count=self.counted_gradient.get_count())
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.linalg import blas
 from typing import Tuple
 
 from methods.abstractions.abstract_optimizator import AbstractOptimizer
@@ -16,7 +17,9 @@ def backtracking_line_search(
     tau = kwargs.get("tau", 0.5)
     alpha = kwargs.get("alpha_init", 1.0)
 
-    f_x = f(x)
+    f_x = kwargs.get("f_x")
+    if f_x is None:
+        f_x = f(x)
     while f(x + alpha * p) > f_x + c * alpha * np.dot(grad, p):
         alpha *= tau
         if alpha < 1e-8:
@@ -24,45 +27,89 @@ def backtracking_line_search(
     return alpha
 
 
+def reset_to_identity(H: np.ndarray) -> None:
+    """Сбрасывает матрицу H в единичную без выделения памяти."""
+    H.fill(0.0)
+    H.flat[::H.shape[0] + 1] = 1.0
+
+
+def bfgs_inverse_update(H: np.ndarray,
+                        s: np.ndarray,
+                        y: np.ndarray,
+                        rho: float,
+                        Hy: np.ndarray,
+                        u: np.ndarray) -> None:
+    """
+    BFGS-обновление обратного гессиана на месте, за O(n²):
+
+        H ← (I - ρ s yᵀ) H (I - ρ y sᵀ) + ρ s sᵀ
+          = H + s uᵀ + u sᵀ,  где u = -ρ H y + ½ (ρ² yᵀHy + ρ) s.
+
+    Это одно симметричное обновление ранга 2 (BLAS dsyr2) верхнего
+    треугольника H, хранящейся в Fortran-порядке.
+
+    Args:
+        H: Обратный гессиан (n×n, Fortran-порядок), изменяется на месте.
+        s: Шаг x_{k+1} - x_k.
+        y: Разность градиентов g_{k+1} - g_k.
+        rho: 1 / (yᵀs).
+        Hy: Рабочий буфер размерности n.
+        u: Рабочий буфер размерности n.
+    """
+    blas.dsymv(1.0, H, y, beta=0.0, y=Hy, overwrite_y=True)
+    np.multiply(s, 0.5 * (rho * rho * np.dot(y, Hy) + rho), out=u)
+    blas.daxpy(Hy, u, a=-rho)
+    blas.dsyr2(1.0, s, u, a=H, overwrite_a=True)
+
+
 class CustomBfgs(AbstractOptimizer):
     def __init__(self, f: ScalarFunction, x0: InitialPoint, grad: GradientFunction, **kwargs) -> None:
         super().__init__("CustomBFGS", f, x0, grad, **kwargs)
+        self.line_search_method = kwargs.get("line_search_method", backtracking_line_search)
         self.params = kwargs
 
     def optimize(self) -> Tuple[np.ndarray, HistoryDict]:
         n = self.x0.size
-        x = self.x0.copy()
-        H = np.eye(n)
-        history: HistoryDict = {'x': [x.copy()], 'f': [self.fun(x)]}
+        x = self.x0.astype(float)
+        # Рабочие буферы выделяются один раз. H хранится в Fortran-порядке, BLAS
+        # (dsymv/dsyr2) читает и обновляет только его верхний треугольник.
+        H = np.asfortranarray(np.eye(n))
+        p = np.empty(n)
+        s = np.empty(n)
+        y = np.empty(n)
+        Hy = np.empty(n)
+        u = np.empty(n)
+        f_x, grad = self.value_and_gradient(x)
+        history = self.start_history(x, f_x)
 
         for k in range(self.max_iter):
-            grad = self.counted_gradient(x)
             grad_norm = np.linalg.norm(grad)
             if grad_norm < self.tol:
                 if self.verbose:
                     print(f"Converged at iteration {k}, ||grad|| = {grad_norm:.2e}")
                 break
 
-            p = -H.dot(grad)
-            alpha = backtracking_line_search(self.counted_function, x, p, grad, **self.params)
-            s = alpha * p
-            x_new = x + s
-            f_new = self.fun(x_new)
-            history['x'].append(x_new.copy())
-            history['f'].append(f_new)
+            blas.dsymv(-1.0, H, grad, beta=0.0, y=p, overwrite_y=True)
+            alpha = self.line_search_method(self.counted_function, x, p, grad=grad, f_x=f_x,
+                                            grad_f=self.counted_gradient,
+                                            value_and_grad_f=self.value_and_gradient, **self.params)
+            np.multiply(p, alpha, out=s)
+            x += s
+            f_new, grad_new = self.value_and_gradient(x)
+            history.append(x, f_new)
 
-            grad_new = self.counted_gradient(x_new)
-            y = grad_new - grad
+            np.subtract(grad_new, grad, out=y)
 
-            if np.dot(y, s) <= 0:
-                H = np.eye(n)
+            ys = np.dot(y, s)
+            if ys <= 0:
+                reset_to_identity(H)
             else:
-                rho = 1.0 / np.dot(y, s)
-                I = np.eye(n)
-                H = (I - rho * np.outer(s, y)).dot(H).dot(I - rho * np.outer(y, s)) + rho * np.outer(s, s)
+                bfgs_inverse_update(H, s, y, 1.0 / ys, Hy, u)
 
-            x = x_new
             if self.verbose:
                 print(f"Iter={k:03d}, α={alpha:.2e}, f(x)={f_new:.6e}, ||grad||={grad_norm:.2e}")
+            f_x, grad = f_new, grad_new
+            if self.should_stop(k, x, f_x):
+                break
 
         return x, history
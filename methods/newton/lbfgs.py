@@ -0,0 +1,112 @@
+import numpy as np
+from typing import Tuple
+
+from methods.abstractions.abstract_optimizator import AbstractOptimizer
+from methods.newton.custom_bfgs import backtracking_line_search
+from utils.types import ScalarFunction, HistoryDict, GradientFunction, InitialPoint
+
+
+def two_loop_recursion(grad: np.ndarray,
+                       S: np.ndarray,
+                       Y: np.ndarray,
+                       rho: np.ndarray,
+                       order: np.ndarray) -> np.ndarray:
+    """
+    Двухцикловая рекурсия L-BFGS: вычисляет H·grad без явного хранения H.
+
+    Args:
+        grad: Вектор, к которому применяется обратный гессиан.
+        S: Буфер шагов s_i = x_{i+1} - x_i формы (m, n).
+        Y: Буфер разностей градиентов y_i = g_{i+1} - g_i формы (m, n).
+        rho: Буфер 1 / (y_i · s_i) формы (m,).
+        order: Индексы заполненных ячеек буфера от старых пар к новым.
+
+    Returns:
+        Вектор H·grad (np.ndarray размерности n).
+    """
+    q = grad.copy()
+    alphas = np.empty(len(order))
+    for k in range(len(order) - 1, -1, -1):
+        i = order[k]
+        alphas[k] = rho[i] * np.dot(S[i], q)
+        q -= alphas[k] * Y[i]
+
+    if len(order):
+        newest = order[-1]
+        q *= np.dot(S[newest], Y[newest]) / np.dot(Y[newest], Y[newest])
+
+    for k in range(len(order)):
+        i = order[k]
+        beta = rho[i] * np.dot(Y[i], q)
+        q += (alphas[k] - beta) * S[i]
+    return q
+
+
+class CustomLBfgs(AbstractOptimizer):
+    """
+    BFGS с ограниченной памятью (L-BFGS).
+
+    Вместо плотной матрицы n×n хранятся m последних пар (s, y) в кольцевых
+    буферах, поэтому память O(mn), а шаг — O(mn) операций.
+
+    Параметры (kwargs):
+        history_size: число хранимых пар (s, y), по умолчанию 10.
+        line_search_method: метод одномерного поиска (по умолчанию backtracking_line_search).
+        c, tau, alpha_init: параметры backtracking_line_search.
+    """
+
+    def __init__(self, f: ScalarFunction, x0: InitialPoint, grad: GradientFunction = None, **kwargs) -> None:
+        super().__init__("CustomLBFGS", f, x0, grad, **kwargs)
+        self.history_size = kwargs.get("history_size", 10)
+        self.line_search_method = kwargs.get("line_search_method", backtracking_line_search)
+        self.params = kwargs
+
+    def optimize(self) -> Tuple[np.ndarray, HistoryDict]:
+        n = self.x0.size
+        m = self.history_size
+        x = self.x0.astype(float)
+        f_x, grad = self.value_and_gradient(x)
+        history = self.start_history(x, f_x)
+
+        S = np.zeros((m, n))
+        Y = np.zeros((m, n))
+        rho = np.zeros(m)
+        stored = 0
+        head = 0
+
+        for k in range(self.max_iter):
+            grad_norm = np.linalg.norm(grad)
+            if grad_norm < self.tol:
+                if self.verbose:
+                    print(f"Converged at iteration {k}, ||grad|| = {grad_norm:.2e}")
+                break
+
+            order = (head - stored + np.arange(stored)) % m
+            p = -two_loop_recursion(grad, S, Y, rho, order)
+            alpha = self.line_search_method(self.counted_function, x, p, grad=grad, f_x=f_x,
+                                            grad_f=self.counted_gradient,
+                                            value_and_grad_f=self.value_and_gradient, **self.params)
+            s = alpha * p
+            x_new = x + s
+            f_new, grad_new = self.value_and_gradient(x_new)
+            history.append(x_new, f_new)
+
+            y = grad_new - grad
+
+            ys = np.dot(y, s)
+            if ys > 0:
+                S[head] = s
+                Y[head] = y
+                rho[head] = 1.0 / ys
+                head = (head + 1) % m
+                stored = min(stored + 1, m)
+            else:
+                stored = 0
+
+            x, f_x, grad = x_new, f_new, grad_new
+            if self.verbose:
+                print(f"Iter={k:03d}, α={alpha:.2e}, f(x)={f_new:.6e}, ||grad||={grad_norm:.2e}")
+            if self.should_stop(k, x, f_x):
+                break
+
+        return x, history
@@ -0,0 +1,182 @@
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+from methods.abstractions.abstract_optimizator import AbstractOptimizer
+from methods.newton.custom_bfgs import backtracking_line_search
+from utils.types import ScalarFunction, HistoryDict, GradientFunction, InitialPoint
+
+FORCING_STRATEGIES = ("ew1", "ew2", "constant")
+_GOLDEN = (1 + np.sqrt(5)) / 2
+
+
+def preconditioned_cg(hessp: Callable[[np.ndarray], np.ndarray],
+                      grad: np.ndarray,
+                      eta: float,
+                      max_iter: int,
+                      precond: Optional[Callable[[np.ndarray], np.ndarray]] = None
+                      ) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Приближённо решает систему Ньютона H·p = -grad предобусловленным методом
+    сопряжённых градиентов (Nocedal & Wright, алг. 7.1).
+
+    Итерации прекращаются, когда ‖H·p + grad‖ ≤ eta·‖grad‖, или при
+    обнаружении неположительной кривизны dᵀHd ≤ 0: тогда возвращается текущее
+    приближение (на первой итерации — предобусловленный антиградиент), поэтому
+    результат всегда является направлением спуска.
+
+    Args:
+        hessp: Произведение гессиана на вектор v -> H·v.
+        grad: Градиент в текущей точке.
+        eta: Относительная точность решения (forcing term).
+        max_iter: Максимальное число итераций CG.
+        precond: Применение обратного предобуславливателя r -> M⁻¹r
+            (M должна быть положительно определённой); None — без него.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, int]: направление p, невязка H·p + grad,
+        число итераций CG.
+    """
+    apply = precond if precond is not None else (lambda r: r)
+    p = np.zeros_like(grad)
+    r = grad.copy()
+    z = apply(r)
+    d = -z
+    rz = np.dot(r, z)
+    tol = eta * np.linalg.norm(grad)
+
+    for j in range(max_iter):
+        Hd = hessp(d)
+        curvature = np.dot(d, Hd)
+        if curvature <= np.finfo(float).eps * np.dot(d, d):
+            if j == 0:
+                p = d
+            return p, r, j + 1
+        a = rz / curvature
+        p += a * d
+        r += a * Hd
+        if np.linalg.norm(r) <= tol:
+            return p, r, j + 1
+        z = apply(r)
+        rz_new = np.dot(r, z)
+        d = -z + (rz_new / rz) * d
+        rz = rz_new
+    return p, r, max_iter
+
+
+class CustomNewtonCG(AbstractOptimizer):
+    """
+    Усечённый метод Ньютона (Newton-CG) без хранения гессиана.
+
+    Направление — приближённое решение системы Ньютона предобусловленным CG,
+    которому нужен только hessp (x, v) -> ∇²f(x)·v. Если hessp не передан,
+    используется разность градиентов (AbstractOptimizer.finite_difference_hessp),
+    поэтому память O(n) и метод применим при n ~ 10⁵. Число произведений
+    гессиана на вектор попадает в OptimizationResult.hessp_call_count.
+
+    Точность решения CG на итерации k задаётся forcing term η_k
+    (Eisenstat & Walker, 1996): вдали от минимума система решается грубо, вблизи —
+    всё точнее, что даёт сверхлинейную сходимость без лишних итераций CG.
+
+    Параметры (kwargs):
+        hessp: произведение гессиана на вектор (x, v) -> ∇²f(x)·v.
+        preconditioner: функция x -> M(x), возвращающая либо положительную
+            диагональ приближения гессиана (np.ndarray), либо функцию
+            r -> M⁻¹r; вычисляется один раз на итерацию.
+        forcing: 'ew1' (по невязке линейной модели), 'ew2' (по отношению норм
+            градиента, по умолчанию) или 'constant'.
+        eta0: начальное (и постоянное для 'constant') значение η, по умолчанию 0.5.
+        eta_max: верхняя граница η, по умолчанию 0.5.
+        ew_gamma, ew_alpha: параметры 'ew2', по умолчанию 0.9 и 2.
+        cg_max_iter: максимум итераций CG на шаг, по умолчанию min(n, 250).
+        line_search_method: метод одномерного поиска (по умолчанию backtracking_line_search).
+        c, tau, alpha_init: параметры backtracking_line_search.
+    """
+
+    def __init__(self, f: ScalarFunction, x0: InitialPoint, grad: GradientFunction = None, **kwargs) -> None:
+        super().__init__("CustomNewtonCG", f, x0, grad, **kwargs)
+        self.preconditioner = kwargs.get("preconditioner")
+        self.forcing = kwargs.get("forcing", "ew2")
+        if self.forcing not in FORCING_STRATEGIES:
+            raise ValueError(f"Unknown forcing strategy: {self.forcing}. Expected one of {FORCING_STRATEGIES}")
+        self.eta0 = kwargs.get("eta0", 0.5)
+        self.eta_max = kwargs.get("eta_max", 0.5)
+        self.ew_gamma = kwargs.get("ew_gamma", 0.9)
+        self.ew_alpha = kwargs.get("ew_alpha", 2.0)
+        self.cg_max_iter = kwargs.get("cg_max_iter", min(np.size(x0), 250))
+        self.line_search_method = kwargs.get("line_search_method", backtracking_line_search)
+        self.params = kwargs
+        self.cg_iterations = 0
+
+    def forcing_term(self, eta_prev: float, grad_norm: float, grad_norm_prev: float,
+                     linear_norm_prev: float) -> float:
+        """
+        η_k по Eisenstat–Walker с защитой от резкого уменьшения:
+            'ew1': η = |‖g_k‖ - ‖g_{k-1} + α H p_{k-1}‖| / ‖g_{k-1}‖;
+            'ew2': η = γ (‖g_k‖ / ‖g_{k-1}‖)^α.
+        Снизу η ограничено так, чтобы не решать систему точнее, чем требует tol.
+        """
+        if self.forcing == "constant":
+            eta = self.eta0
+        elif self.forcing == "ew1":
+            eta = abs(grad_norm - linear_norm_prev) / grad_norm_prev
+            safeguard = eta_prev ** _GOLDEN
+            if safeguard > 0.1:
+                eta = max(eta, safeguard)
+        else:
+            eta = self.ew_gamma * (grad_norm / grad_norm_prev) ** self.ew_alpha
+            safeguard = self.ew_gamma * eta_prev ** self.ew_alpha
+            if safeguard > 0.1:
+                eta = max(eta, safeguard)
+        eta = min(eta, self.eta_max)
+        return max(eta, 0.5 * self.tol / grad_norm)
+
+    def _precond(self, x: np.ndarray) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        if self.preconditioner is None:
+            return None
+        M = self.preconditioner(x)
+        if callable(M):
+            return M
+        diag = np.asarray(M, dtype=float)
+        return lambda r: r / diag
+
+    def optimize(self) -> Tuple[np.ndarray, HistoryDict]:
+        x = self.x0.astype(float)
+        f_x, grad = self.value_and_gradient(x)
+        history = self.start_history(x, f_x)
+        self.cg_iterations = 0
+
+        eta = self.eta0
+        grad_norm_prev = linear_norm_prev = None
+
+        for k in range(self.max_iter):
+            grad_norm = np.linalg.norm(grad)
+            if grad_norm < self.tol:
+                if self.verbose:
+                    print(f"Converged at iteration {k}, ||grad|| = {grad_norm:.2e}")
+                break
+
+            if grad_norm_prev is not None:
+                eta = self.forcing_term(eta, grad_norm, grad_norm_prev, linear_norm_prev)
+
+            x_k = x
+            p, residual, cg_iter = preconditioned_cg(lambda v: self.counted_hessp(x_k, v), grad, eta,
+                                                     self.cg_max_iter, self._precond(x))
+            self.cg_iterations += cg_iter
+
+            alpha = self.line_search_method(self.counted_function, x, p, grad=grad, f_x=f_x,
+                                            grad_f=self.counted_gradient,
+                                            value_and_grad_f=self.value_and_gradient, **self.params)
+            # Невязка линейной модели после шага α: g + αHp = (1 - α)g + α(Hp + g).
+            linear_norm_prev = np.linalg.norm((1 - alpha) * grad + alpha * residual)
+            grad_norm_prev = grad_norm
+
+            x = x + alpha * p
+            f_x, grad = self.value_and_gradient(x)
+            history.append(x, f_x)
+            if self.verbose:
+                print(f"Iter={k:03d}, α={alpha:.2e}, η={eta:.2e}, CG={cg_iter}, "
+                      f"f(x)={f_x:.6e}, ||grad||={grad_norm:.2e}")
+            if self.should_stop(k, x, f_x):
+                break
+
+        return x, history
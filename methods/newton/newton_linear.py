@@ -1,12 +1,109 @@
 import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import cho_factor, cho_solve, eigh
+from scipy.sparse.linalg import splu
 from typing import Tuple
 
 from methods.abstractions.abstract_optimizator import AbstractOptimizer
 from methods.linear_search import golden_section_line_search
 from utils.types import HistoryDict, ScalarFunction, GradientFunction, HessianFunction
 
+HESSIAN_MODIFICATIONS = ("identity", "eigen")
+
+
+class HessianFactor:
+    """
+    Разложение гессиана, которое решает систему H · p = g без повторной
+    факторизации.
+
+    Плотный гессиан раскладывается по Холецкому, разреженный — через splu с
+    симметричным упорядочиванием и диагональным выбором ведущих элементов
+    (знаки диагонали U совпадают со знаками D в LDLᵀ, т.е. дают инерцию H).
+    Если матрица не положительно определена, она модифицируется так, чтобы
+    направление Ньютона оставалось направлением спуска:
+        'identity' — к H добавляется τ·I, τ увеличивается вдвое, пока
+                     разложение не покажет положительную определённость
+                     (Nocedal & Wright, алг. 3.3);
+        'eigen'    — собственные значения заменяются на max(|λ|, delta)
+                     (только для плотного гессиана; разреженный
+                     модифицируется сдвигом τ·I).
+
+    Атрибуты:
+        shift: добавленный сдвиг τ (0, если модификация не понадобилась).
+        kind: 'cholesky', 'lu' или 'eigen'.
+    """
+
+    def __init__(self, hess, modification: str = "identity", beta: float = 1e-3, delta: float = 1e-8) -> None:
+        if modification not in HESSIAN_MODIFICATIONS:
+            raise ValueError(f"Unknown Hessian modification: {modification}. "
+                             f"Expected one of {HESSIAN_MODIFICATIONS}")
+        self.shift = 0.0
+        sparse = sp.issparse(hess)
+        if sparse:
+            self.kind = "lu"
+            hess = sp.csc_matrix(hess, dtype=float)
+            identity = sp.identity(hess.shape[0], format="csc")
+        else:
+            self.kind = "cholesky"
+            hess = np.asarray(hess, dtype=float)
+            identity = np.eye(hess.shape[0])
+
+        if self._factorize(hess):
+            return
+
+        if modification == "eigen" and not sparse:
+            self.kind = "eigen"
+            eigvals, self._eigvecs = eigh(hess)
+            self._eigvals = np.maximum(np.abs(eigvals), delta)
+            self.shift = float(max(0.0, delta - eigvals.min()))
+            return
+
+        min_diag = hess.diagonal().min()
+        tau = beta - min_diag if min_diag <= 0 else beta
+        while not self._factorize(hess + tau * identity):
+            tau = max(2 * tau, beta)
+        self.shift = float(tau)
+
+    def _factorize(self, matrix) -> bool:
+        """Раскладывает matrix; False, если она не положительно определена."""
+        if self.kind == "lu":
+            try:
+                self._lu = splu(matrix, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                                options=dict(SymmetricMode=True))
+            except RuntimeError:  # вырожденная матрица
+                return False
+            return bool(np.all(self._lu.U.diagonal() > 0))
+        try:
+            self._cho = cho_factor(matrix)
+        except np.linalg.LinAlgError:
+            return False
+        return True
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        if self.kind == "lu":
+            return self._lu.solve(rhs)
+        if self.kind == "eigen":
+            return self._eigvecs @ ((self._eigvecs.T @ rhs) / self._eigvals)
+        return cho_solve(self._cho, rhs)
+
 
 class NewtonLineSearch(AbstractOptimizer):
+    """
+    Метод Ньютона с одномерным поиском шага.
+
+    На каждой итерации гессиан раскладывается один раз (см. HessianFactor),
+    направление d = -H⁻¹∇f вычисляется одним решением системы и передаётся в
+    step_selector.
+
+    Гиперпараметры (через kwargs):
+        step_selector: метод одномерного поиска (по умолчанию золотое сечение).
+        hess_modification: 'identity' или 'eigen' — способ исправления
+            незнакоопределённого гессиана.
+        hess_refresh: гессиан и его разложение пересчитываются раз в
+            hess_refresh итераций (1 — классический метод Ньютона, k > 1 —
+            «ленивый» метод Шаманского).
+    """
+
     def __init__(self, f: ScalarFunction, x0: np.ndarray, grad: GradientFunction = None, hess: HessianFunction = None, **kwargs) -> None:
         super().__init__("NewtonLineSearch", f, x0, grad, hess, **kwargs)
         self.f = f
@@ -14,32 +111,60 @@ class NewtonLineSearch(AbstractOptimizer):
         self.params = kwargs
 
         self.step_selector = kwargs.get("step_selector", golden_section_line_search)
+        self.hess_modification = kwargs.get("hess_modification", "identity")
+        self.hess_refresh = max(1, kwargs.get("hess_refresh", 1))
+        self.factorization_count = 0
+
+    def factorize(self, x: np.ndarray) -> HessianFactor:
+        self.factorization_count += 1
+        return HessianFactor(self.counted_hessian(x), self.hess_modification)
 
-    def line_search(self, x: np.ndarray, grad: np.ndarray, hess: np.ndarray) -> float:
-        direction = -np.linalg.solve(hess, grad)
-        alpha = self.step_selector(self.counted_function, x, direction, **self.params)
+    @staticmethod
+    def direction(factor: HessianFactor, grad: np.ndarray) -> np.ndarray:
+        """
+        Направление Ньютона -H⁻¹∇f. Разложение положительно определено, поэтому
+        это направление спуска; -∇f берётся лишь при потере точности (H⁻¹∇f ≈ 0
+        или не конечно).
+        """
+        direction = -factor.solve(grad)
+        if not np.dot(direction, grad) < 0:
+            return -grad
+        return direction
+
+    def line_search(self, x: np.ndarray, grad: np.ndarray, direction: np.ndarray, fx: float = None,
+                    alpha_prev: float = None) -> float:
+        alpha = self.step_selector(self.counted_function, x, direction, grad=grad, f_x=fx,
+                                   grad_f=self.counted_gradient, value_and_grad_f=self.value_and_gradient,
+                                   alpha_prev=alpha_prev, **self.params)
         return alpha
 
     def optimize(self) -> Tuple[np.ndarray, HistoryDict]:
         x = self.x0.copy()
-        history = {'x': [x.copy()], 'f': [self.f(x)]}
+        fx, grad = self.value_and_gradient(x)
+        history = self.start_history(x, fx)
+        alpha = None
+        factor = None
+        self.factorization_count = 0
 
         for i in range(self.max_iter):
-            grad = self.counted_gradient(x)
             norm_g = np.linalg.norm(grad)
             if norm_g < self.tol:
                 if self.verbose:
                     print(f"Converged at iteration {i}, ||grad||={norm_g:.2e}")
                 break
 
-            hess = self.counted_hessian(x)
+            if factor is None or i % self.hess_refresh == 0:
+                factor = self.factorize(x)
 
-            alpha = self.line_search(x, grad, hess)
-            x = x - alpha * np.linalg.solve(hess, grad)
-            fx = self.f(x)
-            history['x'].append(x.copy())
-            history['f'].append(fx)
+            direction = self.direction(factor, grad)
+            alpha = self.line_search(x, grad, direction, fx, alpha)
+            x = x + alpha * direction
+            fx, grad = self.value_and_gradient(x)
+            history.append(x, fx)
             if self.verbose:
-                print(f"Iter={i}, alpha={alpha:.2e}, f(x)={fx:.6e}, ||grad||={norm_g:.2e}")
+                print(f"Iter={i}, alpha={alpha:.2e}, f(x)={fx:.6e}, ||grad||={norm_g:.2e}, "
+                      f"shift={factor.shift:.2e}")
+            if self.should_stop(i, x, fx):
+                break
 
         return x, history
@@ -51,13 +51,12 @@ class CustomScheduledGradientDescent(AbstractOptimizer):
         Returns:
             A tuple of (x, iterations, history), where:
                 - x: The computed minimizer (np.ndarray).
-                - history: A dictionary with history {'x': [...], 'f': [...]}.
+                - history: A TrajectoryBuffer with views history['x'] and history['f'].
         """
         x = self.x0.copy()
-        history: HistoryDict = {'x': [x.copy()], 'f': [self.fun(x)]}
+        fx, g = self.value_and_gradient(x)
+        history = self.start_history(x, fx)
         for k in range(self.max_iter):
-            g = self.counted_gradient(x)
-
             grad_norm = np.linalg.norm(g)
             if grad_norm < self.tol:
                 if self.verbose:
@@ -69,10 +68,12 @@ class CustomScheduledGradientDescent(AbstractOptimizer):
                 if self.verbose:
                     print(f"[STOP] Iteration {k}: NaN or Inf encountered in x")
                 break
-            history['x'].append(x.copy())
-            history['f'].append(self.fun(x))
+            fx, g = self.value_and_gradient(x)
+            history.append(x, fx)
             if self.verbose:
-                print(f"[{k:03d}] f(x) = {self.fun(x):.6f}, ||grad|| = {grad_norm:.2e}, lr = {lr:.4e}")
+                print(f"[{k:03d}] f(x) = {fx:.6f}, ||grad|| = {grad_norm:.2e}, lr = {lr:.4e}")
+            if self.should_stop(k, x, fx):
+                break
         return x, history
 
 
@@ -28,26 +28,32 @@ class CustomGradientDescentOptimizer(AbstractOptimizer):
         Возвращает:
             Tuple[np.ndarray, HistoryDict]:
                 - np.ndarray: Найденная точка минимума (x*).
-                - HistoryDict: История оптимизации с ключами:
-                    - 'x': список пройденных точек (np.ndarray),
-                    - 'f': список значений функции в этих точках.
+                - HistoryDict: История оптимизации (TrajectoryBuffer) с ключами:
+                    - 'x': пройденные точки (массив формы (size, n)),
+                    - 'f': значения функции в этих точках.
         """
 
-        history: HistoryDict = {'x': [self.x0.copy()], 'f': [self.fun(self.x0)]}
         x = self.x0.copy()
+        fx, g = self.value_and_gradient(x)
+        history = self.start_history(x, fx)
+        alpha = None
 
         for i in range(self.max_iter):
-            g = self.counted_gradient(x)
-            if np.linalg.norm(g) < self.tol:
+            grad_norm = np.linalg.norm(g)
+            if grad_norm < self.tol:
                 if self.verbose:
                     print(f"Сходимость достигнута на итерации {i}")
                 break
             d = -g
-            alpha = self.line_search_method(self.counted_function, x, d, **self.params)
+            alpha = self.line_search_method(self.counted_function, x, d, grad=g, f_x=fx,
+                                            grad_f=self.counted_gradient, value_and_grad_f=self.value_and_gradient,
+                                            alpha_prev=alpha, **self.params)
             x = x + alpha * d
-            history['x'].append(x.copy())
-            history['f'].append(self.fun(x))
+            fx, g = self.value_and_gradient(x)
+            history.append(x, fx)
             if self.verbose:
-                print(f"Итерация {i}: f(x) = {self.fun(x):.6f}, α = {alpha:.6f}, ||g|| = {np.linalg.norm(g):.6f}")
+                print(f"Итерация {i}: f(x) = {fx:.6f}, α = {alpha:.6f}, ||g|| = {grad_norm:.6f}")
+            if self.should_stop(i, x, fx):
+                break
 
         return x, history
@@ -0,0 +1,23 @@
+import os
+
+import numpy as np
+
+from functions.funcs import quadratic_function
+from visualizations.rendering import BatchRenderer
+
+
+def test_deferred_render_keeps_dotted_names(tmp_path):
+    history = {"x": np.array([[1.0, 1.0], [0.5, 0.5], [0.0, 0.0]]), "f": np.array([2.0, 0.5, 0.0])}
+    save_path = os.path.join(tmp_path, "result_x0_[1. 1.]_lr_0.1.png")
+    base = save_path[:-len(".png")]
+
+    with BatchRenderer(mode="deferred", dpi=20) as renderer:
+        renderer.render(quadratic_function, history, "deferred", save_path, lim=2)
+    assert os.path.exists(base + ".render.npz")
+
+    with BatchRenderer(dpi=20) as renderer:
+        assert renderer.render_all_deferred(str(tmp_path)) == 1
+
+    for suffix in (".png", "_dual.png", "_3dtraj.png"):
+        assert os.path.exists(base + suffix), base + suffix
+    assert not os.path.exists(os.path.join(tmp_path, "result_x0_[1. 1.]_lr_0.png"))
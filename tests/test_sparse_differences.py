@@ -0,0 +1,26 @@
+import numpy as np
+import scipy.sparse as sp
+
+from utils.sparse_differences import approx_sparse_jacobian, banded_pattern, color_columns
+
+
+def test_color_columns_large_overlap():
+    # Столбцы имеют 256 общих строк: в int8 число конфликтов переполнялось в 0.
+    pattern = np.ones((256, 2), dtype=bool)
+    colors = color_columns(pattern)
+    assert colors[0] != colors[1]
+
+
+def test_sparse_jacobian_large_overlap():
+    A = np.random.default_rng(0).normal(size=(512, 3))
+    jac = approx_sparse_jacobian(lambda x: A @ x, np.ones(3), np.ones_like(A, dtype=bool))
+    np.testing.assert_allclose(jac.toarray(), A, rtol=1e-5, atol=1e-6)
+
+
+def test_color_columns_banded():
+    pattern = banded_pattern(10, bandwidth=1)
+    colors = color_columns(pattern)
+    assert colors.max() + 1 == 3
+    conflicts = (sp.csc_matrix(pattern, dtype=int).T @ sp.csc_matrix(pattern, dtype=int)).tocoo()
+    off_diagonal = conflicts.row != conflicts.col
+    assert np.all(colors[conflicts.row[off_diagonal]] != colors[conflicts.col[off_diagonal]])
@@ -0,0 +1,60 @@
+from typing import Callable
+
+import numpy as np
+
+
+def vectorized(func: Callable) -> Callable:
+    """
+    Помечает функцию как поддерживающую пакетное вычисление.
+
+    Помеченная функция принимает как одну точку формы (n,), так и пакет
+    точек формы (m, n), и возвращает результаты по всем точкам сразу
+    (для f — форма (m,), для градиента — (m, n), для гессиана — (m, n, n)).
+    """
+    func.vectorized = True
+    return func
+
+
+def is_vectorized(func: Callable) -> bool:
+    """Проверяет, поддерживает ли функция пакетное вычисление."""
+    return getattr(func, "vectorized", False)
+
+
+def evaluate_batch(func: Callable, points: np.ndarray) -> np.ndarray:
+    """
+    Вычисляет функцию во всех точках пакета.
+
+    Если функция помечена как векторизованная, выполняется один вызов на весь
+    массив точек, иначе — цикл по строкам.
+
+    Args:
+        func: Функция от точки (скалярная или векторная).
+        points: Массив точек формы (m, n).
+
+    Returns:
+        Массив результатов, первая ось которого соответствует точкам.
+    """
+    points = np.asarray(points)
+    if is_vectorized(func):
+        return np.asarray(func(points))
+    return np.array([func(p) for p in points])
+
+
+def supports_broadcasting(func: Callable, n: int = 2) -> bool:
+    """
+    Проверяет, можно ли вычислить функцию на пакете точек (m, n) одним вызовом.
+
+    Для функций, помеченных vectorized, ответ известен сразу. Для остальных
+    выполняется пробный вызов на двух точках, результат которого сравнивается
+    с поточечным вычислением.
+    """
+    if is_vectorized(func):
+        return True
+    probe = 0.5 + np.arange(2 * n, dtype=float).reshape(2, n) / (2 * n)
+    try:
+        with np.errstate(all="ignore"):
+            batch = np.asarray(func(probe), dtype=float)
+            single = np.array([func(p) for p in probe], dtype=float)
+    except Exception:
+        return False
+    return batch.shape == single.shape and np.allclose(batch, single, equal_nan=True)
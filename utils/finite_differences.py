@@ -0,0 +1,285 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+from utils.batch import evaluate_batch
+
+# Векторизованные конечные разности. Все возмущённые точки схемы собираются
+# в один массив (m, n) и вычисляются одним пакетным вызовом (см. utils.batch),
+# кусками не более chunk_size строк, чтобы ограничить память при больших n.
+
+METHODS = ("forward", "central", "complex")
+
+# Относительный шаг по умолчанию: оптимальный баланс ошибки усечения
+# и ошибки округления для соответствующей схемы.
+_EPS = np.finfo(float).eps
+GRADIENT_REL_STEP = {"forward": _EPS ** (1 / 2), "central": _EPS ** (1 / 3), "complex": 1e-20}
+HESSIAN_REL_STEP = {"forward": _EPS ** (1 / 3), "central": _EPS ** (1 / 4), "complex": _EPS ** (1 / 3)}
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _check_method(method: str) -> None:
+    if method not in METHODS:
+        raise ValueError(f"Unknown finite difference method: {method}. Expected one of {METHODS}")
+
+
+def adaptive_steps(x: np.ndarray,
+                   rel_step: float,
+                   abs_step: Optional[float] = None,
+                   representable: bool = True) -> np.ndarray:
+    """
+    Выбирает шаг отдельно для каждой координаты: h_i = rel_step * max(1, |x_i|).
+
+    Шаг корректируется так, чтобы x_i + h_i - x_i было точно представимо
+    в арифметике с плавающей точкой (для комплексного шага это не требуется).
+
+    Args:
+        x: Точка (np.ndarray размерности n).
+        rel_step: Относительный шаг.
+        abs_step: Если задан, используется одинаковый абсолютный шаг для всех координат.
+        representable: Корректировать ли шаг под представимость x + h.
+
+    Returns:
+        Вектор шагов h (np.ndarray размерности n).
+    """
+    x = np.asarray(x, dtype=float)
+    if abs_step is not None:
+        h = np.full(x.shape, float(abs_step))
+    else:
+        sign = np.where(x >= 0, 1.0, -1.0)
+        h = rel_step * sign * np.maximum(1.0, np.abs(x))
+    return (x + h) - x if representable else h
+
+
+def _evaluate_perturbed(f: Callable,
+                        x: np.ndarray,
+                        idx_a: np.ndarray, step_a: np.ndarray,
+                        idx_b: Optional[np.ndarray] = None, step_b: Optional[np.ndarray] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Вычисляет f в точках x + step_a[k] e_{idx_a[k]} (+ step_b[k] e_{idx_b[k]}).
+
+    Точки строятся пакетами по chunk_size строк и вычисляются одним вызовом на пакет.
+    """
+    m = len(idx_a)
+    dtype = np.result_type(x, step_a, float) if step_b is None else np.result_type(x, step_a, step_b, float)
+    results = []
+    for start in range(0, m, chunk_size):
+        stop = min(start + chunk_size, m)
+        rows = np.arange(stop - start)
+        points = np.tile(np.asarray(x, dtype=dtype), (stop - start, 1))
+        points[rows, idx_a[start:stop]] += step_a[start:stop]
+        if idx_b is not None:
+            points[rows, idx_b[start:stop]] += step_b[start:stop]
+        results.append(evaluate_batch(f, points))
+    return np.concatenate(results) if results else np.empty(0)
+
+
+def approx_jacobian(fun: Callable[[np.ndarray], np.ndarray],
+                    x: np.ndarray,
+                    method: str = "central",
+                    rel_step: Optional[float] = None,
+                    abs_step: Optional[float] = None,
+                    f0: Optional[np.ndarray] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Численно вычисляет матрицу Якоби J[i, j] = ∂fun_i/∂x_j.
+
+    Для скалярной функции результат имеет форму (n,) — это градиент.
+
+    Args:
+        fun: Функция ℝⁿ → ℝᵏ (или ℝ). Если помечена как векторизованная,
+            все возмущённые точки вычисляются одним вызовом.
+        x: Точка, в которой считаются производные.
+        method: 'forward' (n+1 вызов), 'central' (2n) или 'complex' (n,
+            требует, чтобы fun была аналитична и поддерживала комплексный вход).
+        rel_step: Относительный шаг (по умолчанию — оптимальный для схемы).
+        abs_step: Абсолютный шаг, одинаковый для всех координат.
+        f0: Уже известное значение fun(x) (для схемы 'forward').
+        chunk_size: Максимальное число точек в одном пакетном вызове.
+
+    Returns:
+        Матрица Якоби формы (k, n) или градиент формы (n,).
+    """
+    _check_method(method)
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    h = adaptive_steps(x, GRADIENT_REL_STEP[method] if rel_step is None else rel_step, abs_step,
+                       representable=method != "complex")
+    idx = np.arange(n)
+
+    if method == "forward":
+        if f0 is None:
+            f0 = fun(x)
+        values = _evaluate_perturbed(fun, x, idx, h, chunk_size=chunk_size)
+        diffs = (values - np.asarray(f0)) / h.reshape((n,) + (1,) * (values.ndim - 1))
+    elif method == "central":
+        values = _evaluate_perturbed(fun, x, np.concatenate([idx, idx]), np.concatenate([h, -h]),
+                                     chunk_size=chunk_size)
+        diffs = (values[:n] - values[n:]) / (2 * h.reshape((n,) + (1,) * (values.ndim - 1)))
+    else:
+        values = _evaluate_perturbed(fun, x, idx, 1j * h, chunk_size=chunk_size)
+        diffs = np.imag(values) / h.reshape((n,) + (1,) * (values.ndim - 1))
+
+    return np.real(diffs).T
+
+
+def approx_gradient(f: Callable[[np.ndarray], float],
+                    x: np.ndarray,
+                    method: str = "central",
+                    rel_step: Optional[float] = None,
+                    abs_step: Optional[float] = None,
+                    f0: Optional[float] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Численно вычисляет градиент скалярной функции f в точке x.
+
+    Все n (или 2n) возмущённых точек вычисляются одним пакетным вызовом,
+    если f векторизована. Параметры — как у approx_jacobian.
+
+    Returns:
+        Вектор градиента (np.ndarray размерности n).
+    """
+    return approx_jacobian(f, x, method, rel_step, abs_step, f0, chunk_size)
+
+
+def approx_hessian(f: Callable[[np.ndarray], float],
+                   x: np.ndarray,
+                   method: str = "central",
+                   rel_step: Optional[float] = None,
+                   abs_step: Optional[float] = None,
+                   f0: Optional[float] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Численно вычисляет гессиан скалярной функции f в точке x.
+
+    Используется симметрия: вычисляются только n(n+1)/2 элементов верхнего
+    треугольника, после чего матрица отражается.
+
+    Схемы и число вызовов f:
+        'forward': (f_ij - f_i - f_j + f_0) / (h_i h_j) — n(n+1)/2 + n + 1;
+        'central': четырёхточечная схема вне диагонали и трёхточечная на диагонали — 2n² + 1;
+        'complex': Im[f(x + i h_i e_i + h_j e_j) - f(x + i h_i e_i - h_j e_j)] / (2 h_i h_j) — n(n+1).
+
+    Args:
+        f: Скалярная функция f: ℝⁿ → ℝ.
+        x: Точка, в которой вычисляется гессиан.
+        method: Разностная схема ('forward', 'central', 'complex').
+        rel_step: Относительный шаг (по умолчанию — оптимальный для схемы).
+        abs_step: Абсолютный шаг, одинаковый для всех координат.
+        f0: Уже известное значение f(x).
+        chunk_size: Максимальное число точек в одном пакетном вызове.
+
+    Returns:
+        Гессиан f в точке x (матрица n×n).
+    """
+    _check_method(method)
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    h = adaptive_steps(x, HESSIAN_REL_STEP[method] if rel_step is None else rel_step, abs_step)
+    rows, cols = np.triu_indices(n)
+    hess = np.zeros((n, n))
+
+    if method == "forward":
+        if f0 is None:
+            f0 = f(x)
+        f_i = _evaluate_perturbed(f, x, np.arange(n), h, chunk_size=chunk_size)
+        f_ij = _evaluate_perturbed(f, x, rows, h[rows], cols, h[cols], chunk_size=chunk_size)
+        hess[rows, cols] = (f_ij - f_i[rows] - f_i[cols] + f0) / (h[rows] * h[cols])
+    elif method == "central":
+        if f0 is None:
+            f0 = f(x)
+        idx = np.arange(n)
+        f_diag = _evaluate_perturbed(f, x, np.concatenate([idx, idx]), np.concatenate([h, -h]),
+                                     chunk_size=chunk_size)
+        hess[idx, idx] = (f_diag[:n] - 2 * f0 + f_diag[n:]) / h ** 2
+
+        upper = rows < cols
+        r, c = rows[upper], cols[upper]
+        m = r.size
+        signs_a = np.repeat([1.0, 1.0, -1.0, -1.0], m)
+        signs_b = np.repeat([1.0, -1.0, 1.0, -1.0], m)
+        r4, c4 = np.tile(r, 4), np.tile(c, 4)
+        values = _evaluate_perturbed(f, x, r4, signs_a * h[r4], c4, signs_b * h[c4], chunk_size=chunk_size)
+        pp, pm, mp, mm = values.reshape(4, m)
+        hess[r, c] = (pp - pm - mp + mm) / (4 * h[r] * h[c])
+    else:
+        m = rows.size
+        values = _evaluate_perturbed(f, x,
+                                     np.concatenate([rows, rows]), np.concatenate([1j * h[rows], 1j * h[rows]]),
+                                     np.concatenate([cols, cols]), np.concatenate([h[cols], -h[cols]]),
+                                     chunk_size=chunk_size)
+        hess[rows, cols] = np.imag(values[:m] - values[m:]) / (2 * h[rows] * h[cols])
+
+    return np.triu(hess) + np.triu(hess, 1).T
+
+
+def approx_hessian_from_gradient(grad: Callable[[np.ndarray], np.ndarray],
+                                 x: np.ndarray,
+                                 method: str = "forward",
+                                 rel_step: Optional[float] = None,
+                                 grad0: Optional[np.ndarray] = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Численно вычисляет гессиан как матрицу Якоби аналитического градиента.
+
+    Требует n вычислений градиента ('forward', если grad0 известен) или 2n
+    ('central') вместо O(n²) вычислений функции. Результат симметризуется:
+    H = (J + Jᵀ) / 2.
+
+    Args:
+        grad: Градиент ∇f: ℝⁿ → ℝⁿ.
+        x: Точка, в которой вычисляется гессиан.
+        method: Разностная схема ('forward', 'central', 'complex').
+        rel_step: Относительный шаг (по умолчанию — оптимальный для схемы).
+        grad0: Уже известное значение ∇f(x) (для 'forward').
+        chunk_size: Максимальное число точек в одном пакетном вызове.
+
+    Returns:
+        Гессиан f в точке x (матрица n×n).
+    """
+    jac = np.atleast_2d(approx_jacobian(grad, x, method, rel_step, f0=grad0, chunk_size=chunk_size))
+    return (jac + jac.T) / 2
+
+
+def approx_hessp(grad: Callable[[np.ndarray], np.ndarray],
+                 x: np.ndarray,
+                 v: np.ndarray,
+                 method: str = "forward",
+                 rel_step: Optional[float] = None,
+                 grad0: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Численно вычисляет произведение гессиана на вектор ∇²f(x)·v по разностям
+    градиента вдоль v, не формируя гессиан.
+
+    Схемы и число вызовов grad:
+        'forward': (∇f(x + h v) - ∇f(x)) / h — 1 (если grad0 известен);
+        'central': (∇f(x + h v) - ∇f(x - h v)) / (2h) — 2.
+    Шаг h = rel_step · max(1, ‖x‖) / ‖v‖.
+
+    Args:
+        grad: Градиент ∇f: ℝⁿ → ℝⁿ.
+        x: Точка, в которой вычисляется гессиан.
+        v: Вектор, на который умножается гессиан.
+        method: Разностная схема ('forward' или 'central').
+        rel_step: Относительный шаг (по умолчанию — оптимальный для схемы).
+        grad0: Уже известное значение ∇f(x) (для 'forward').
+
+    Returns:
+        Вектор ∇²f(x)·v (np.ndarray размерности n).
+    """
+    if method not in ("forward", "central"):
+        raise ValueError(f"Unknown Hessian-vector product method: {method}. Expected 'forward' or 'central'")
+    x = np.asarray(x, dtype=float)
+    v = np.asarray(v, dtype=float)
+    norm_v = np.linalg.norm(v)
+    if norm_v == 0:
+        return np.zeros_like(x)
+    rel_step = GRADIENT_REL_STEP[method] if rel_step is None else rel_step
+    h = rel_step * max(1.0, np.linalg.norm(x)) / norm_v
+    if method == "forward":
+        if grad0 is None:
+            grad0 = grad(x)
+        return (np.asarray(grad(x + h * v)) - grad0) / h
+    return (np.asarray(grad(x + h * v)) - np.asarray(grad(x - h * v))) / (2 * h)
@@ -0,0 +1,147 @@
+from typing import Callable, Optional, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from utils.batch import evaluate_batch
+from utils.finite_differences import adaptive_steps, GRADIENT_REL_STEP
+
+# Конечные разности с учётом разреженности (схема Curtis–Powell–Reid).
+# Столбцы Якобиана, не имеющие общих ненулевых строк, возмущаются одновременно,
+# поэтому число вычислений равно числу цветов, а не n.
+
+SparsityPattern = Union[sp.spmatrix, np.ndarray]
+
+
+def banded_pattern(n: int, bandwidth: int = 1) -> sp.csr_matrix:
+    """
+    Ленточный шаблон разреженности n×n с полушириной bandwidth
+    (bandwidth=1 — трёхдиагональная матрица).
+    """
+    offsets = list(range(-bandwidth, bandwidth + 1))
+    return sp.diags([np.ones(n - abs(k)) for k in offsets], offsets, shape=(n, n), format="csr").astype(bool)
+
+
+def block_diagonal_pattern(n: int, block_size: int) -> sp.csr_matrix:
+    """Блочно-диагональный шаблон разреженности n×n с квадратными блоками block_size."""
+    if n % block_size:
+        raise ValueError(f"n={n} is not divisible by block_size={block_size}")
+    return sp.block_diag([np.ones((block_size, block_size), dtype=bool)] * (n // block_size), format="csr")
+
+
+def color_columns(pattern: SparsityPattern) -> np.ndarray:
+    """
+    Жадная раскраска столбцов шаблона (Curtis–Powell–Reid).
+
+    Два столбца конфликтуют, если у них есть общая ненулевая строка. Столбцы
+    обрабатываются в порядке убывания числа конфликтов (largest-first), каждому
+    назначается наименьший цвет, не занятый соседями.
+
+    Args:
+        pattern: Шаблон разреженности (k×n), scipy.sparse или булев массив.
+
+    Returns:
+        Массив цветов размерности n (целые от 0 до n_colors - 1).
+    """
+    # Число общих строк считается в int32: в int8 перекрытие, кратное 256,
+    # обнулилось бы, и конфликтующие столбцы получили бы один цвет.
+    structure = sp.csc_matrix(pattern, dtype=bool).astype(np.int32)
+    conflicts = (structure.T @ structure).tocsr()
+    n = conflicts.shape[0]
+    degree = np.diff(conflicts.indptr)
+    colors = np.full(n, -1, dtype=int)
+
+    for j in np.argsort(-degree, kind="stable"):
+        neighbours = conflicts.indices[conflicts.indptr[j]:conflicts.indptr[j + 1]]
+        used = set(colors[neighbours][colors[neighbours] >= 0])
+        color = 0
+        while color in used:
+            color += 1
+        colors[j] = color
+    return colors
+
+
+def approx_sparse_jacobian(fun: Callable[[np.ndarray], np.ndarray],
+                           x: np.ndarray,
+                           pattern: SparsityPattern,
+                           method: str = "forward",
+                           rel_step: Optional[float] = None,
+                           abs_step: Optional[float] = None,
+                           f0: Optional[np.ndarray] = None,
+                           colors: Optional[np.ndarray] = None) -> sp.csr_matrix:
+    """
+    Численно вычисляет разреженную матрицу Якоби по известному шаблону.
+
+    Для каждого цвета c строится одно возмущение x + Σ_{j ∈ c} h_j e_j; все
+    возмущённые точки вычисляются одним пакетным вызовом.
+
+    Args:
+        fun: Функция ℝⁿ → ℝᵏ.
+        x: Точка, в которой считается Якобиан.
+        pattern: Шаблон ненулевых элементов Якобиана (k×n).
+        method: 'forward' (n_colors + 1 вызов) или 'central' (2 n_colors).
+        rel_step: Относительный шаг (по умолчанию — оптимальный для схемы).
+        abs_step: Абсолютный шаг, одинаковый для всех координат.
+        f0: Уже известное значение fun(x) (для схемы 'forward').
+        colors: Готовая раскраска столбцов (иначе вычисляется color_columns).
+
+    Returns:
+        Якобиан в формате scipy.sparse.csr_matrix.
+    """
+    if method not in ("forward", "central"):
+        raise ValueError(f"Unsupported method for sparse differences: {method}")
+    x = np.asarray(x, dtype=float)
+    pattern = sp.coo_matrix(pattern)
+    if colors is None:
+        colors = color_columns(pattern)
+    n_colors = colors.max() + 1
+    h = adaptive_steps(x, GRADIENT_REL_STEP[method] if rel_step is None else rel_step, abs_step)
+
+    directions = np.zeros((n_colors, x.size))
+    directions[colors, np.arange(x.size)] = h
+
+    if method == "forward":
+        if f0 is None:
+            f0 = fun(x)
+        diffs = evaluate_batch(fun, x + directions) - np.asarray(f0)
+    else:
+        values = evaluate_batch(fun, np.concatenate([x + directions, x - directions]))
+        diffs = (values[:n_colors] - values[n_colors:]) / 2
+
+    rows, cols = pattern.row, pattern.col
+    data = diffs[colors[cols], rows] / h[cols]
+    return sp.csr_matrix((data, (rows, cols)), shape=pattern.shape)
+
+
+def approx_sparse_hessian(grad: Callable[[np.ndarray], np.ndarray],
+                          x: np.ndarray,
+                          pattern: SparsityPattern,
+                          method: str = "forward",
+                          colors: Optional[np.ndarray] = None,
+                          **kwargs) -> sp.csr_matrix:
+    """
+    Восстанавливает разреженный гессиан по разностям градиента.
+
+    Требует n_colors (+1) вычислений градиента вместо O(n²) вычислений функции.
+    Результат симметризуется: H = (J + Jᵀ) / 2.
+
+    Args:
+        grad: Градиент ∇f: ℝⁿ → ℝⁿ.
+        x: Точка, в которой вычисляется гессиан.
+        pattern: Симметричный шаблон ненулевых элементов гессиана (n×n).
+        method: 'forward' или 'central'.
+        colors: Готовая раскраска столбцов.
+        **kwargs: Остальные параметры approx_sparse_jacobian.
+
+    Returns:
+        Гессиан в формате scipy.sparse.csr_matrix.
+    """
+    jac = approx_sparse_jacobian(grad, x, pattern, method=method, colors=colors, **kwargs)
+    return ((jac + jac.T) / 2).tocsr()
+
+
+def create_sparse_hessian(grad: Callable[[np.ndarray], np.ndarray],
+                          pattern: SparsityPattern,
+                          method: str = "forward") -> Callable[[np.ndarray], sp.csr_matrix]:
+    colors = color_columns(pattern)
+    return lambda x: approx_sparse_hessian(grad, x, pattern, method=method, colors=colors)
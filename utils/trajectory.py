@@ -0,0 +1,315 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+class _StridedHistory(ABC):
+    """
+    Общая логика записи траектории с шагом stride.
+
+    Наследники реализуют _record (сохранить точку) и _last_recorded (номер
+    последней сохранённой итерации или -1). Последняя точка, пропущенная из-за
+    stride, сохраняется только в close(); чтение до close() ничего не
+    записывает, а лишь добавляет эту точку к возвращаемой копии.
+    """
+
+    KEYS = ("x", "f", "k")
+
+    def __init__(self, stride: int = 1) -> None:
+        if stride < 0:
+            raise ValueError(f"History stride must be non-negative, got {stride}")
+        self.stride = stride
+        self.total = 0
+        self._last_x: Optional[np.ndarray] = None
+        self._last_f = np.nan
+
+    @abstractmethod
+    def _record(self, x: np.ndarray, f: float, k: int) -> None:
+        ...
+
+    @abstractmethod
+    def _last_recorded(self) -> int:
+        ...
+
+    def _has_unrecorded_last(self) -> bool:
+        return bool(self.total) and self._last_recorded() != self.total - 1
+
+    def _with_unrecorded_last(self, key: str, data: np.ndarray) -> np.ndarray:
+        """data с добавленной последней точкой, если она ещё не сохранена."""
+        if not self._has_unrecorded_last():
+            return data
+        last = {"x": self._last_x[None, :], "f": [self._last_f], "k": [self.total - 1]}[key]
+        return np.concatenate([data, np.asarray(last, dtype=data.dtype)])
+
+    def _should_record(self, k: int) -> bool:
+        return k == 0 if self.stride == 0 else k % self.stride == 0
+
+    def append(self, x: np.ndarray, f: float) -> None:
+        """Добавляет точку x и значение f(x); данные копируются."""
+        x = np.ravel(x)
+        if self._last_x is None:
+            self._last_x = np.empty(x.size)
+        k = self.total
+        self.total += 1
+        if self._should_record(k):
+            self._record(x, f, k)
+        else:
+            self._last_x[...] = x
+            self._last_f = f
+
+    def close(self):
+        """Дописывает последнюю точку, если она была пропущена из-за stride."""
+        if self._has_unrecorded_last():
+            self._record(self._last_x, self._last_f, self.total - 1)
+        return self
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def keys(self):
+        return self.KEYS
+
+
+class TrajectoryBuffer(_StridedHistory):
+    """
+    Компактное хранилище траектории оптимизации.
+
+    Точки лежат в одном непрерывном массиве (capacity, n) float64, значения
+    функции — в параллельном массиве (capacity,). При заполнении ёмкость
+    удваивается, поэтому добавление стоит O(n) амортизированно и не создаёт
+    отдельный массив на каждую итерацию.
+
+    Доступ совместим со старым HistoryDict: history['x'] — представление
+    (без копирования) формы (size, n), history['f'] — формы (size,),
+    history['k'] — номера сохранённых итераций. До close() последняя точка,
+    пропущенная из-за stride, добавляется к копии данных.
+
+    Атрибуты:
+        stride: шаг записи. 1 — каждая точка, k — каждая k-я, 0 — запись
+            отключена (сохраняются только начальная и последняя точки).
+        total: число точек, переданных в append (включая не сохранённые).
+    """
+
+    def __init__(self, n: Optional[int] = None, capacity: int = 64, stride: int = 1) -> None:
+        super().__init__(stride)
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._x: Optional[np.ndarray] = None
+        self._f = np.empty(self._capacity)
+        self._k = np.empty(self._capacity, dtype=np.int64)
+        if n is not None:
+            self._x = np.empty((self._capacity, n))
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name in ("_x", "_f", "_k"):
+            old = getattr(self, name)
+            new = np.empty((self._capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _record(self, x: np.ndarray, f: float, k: int) -> None:
+        if self._x is None:
+            self._x = np.empty((self._capacity, x.size))
+        if self._size == self._capacity:
+            self._grow()
+        self._x[self._size] = x
+        self._f[self._size] = f
+        self._k[self._size] = k
+        self._size += 1
+
+    def _last_recorded(self) -> int:
+        return self._k[self._size - 1] if self._size else -1
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        if key == "x":
+            data = self._x[:self._size] if self._x is not None else np.empty((0, 0))
+        elif key == "f":
+            data = self._f[:self._size]
+        elif key == "k":
+            data = self._k[:self._size]
+        else:
+            raise KeyError(key)
+        return self._with_unrecorded_last(key, data)
+
+    @property
+    def size(self) -> int:
+        """Число сохранённых точек (с учётом последней точки до close())."""
+        return self._size + self._has_unrecorded_last()
+
+    def __repr__(self) -> str:
+        n = self._x.shape[1] if self._x is not None else None
+        return f"TrajectoryBuffer(n={n}, size={self._size}, total={self.total}, stride={self.stride})"
+
+
+# ==== ПОТОКОВАЯ ЗАПИСЬ НА ДИСК ====
+# Формат каталога траектории: x.f64 (size × n, float64, C-порядок), f.f64 (size),
+# k.i64 (size, int64) — «сырые» little-endian файлы, дописываемые кусками, и
+# meta.json с размерностью, шагом и (после закрытия) числом точек. Число
+# записанных точек определяется по размеру файлов, поэтому meta.json пишется
+# только при создании и закрытии записи. Такой каталог читается лениво через
+# np.memmap (см. TrajectoryReader).
+
+_X_FILE, _F_FILE, _K_FILE, _META_FILE = "x.f64", "f.f64", "k.i64", "meta.json"
+
+
+class TrajectoryReader:
+    """
+    Ленивое чтение траектории, записанной TrajectoryWriter.
+
+    reader['x'] — np.memmap формы (size, n): срез reader['x'][a:b] читает с
+    диска только нужные итерации. reader['f'] и reader['k'] — аналогично.
+    """
+
+    KEYS = _StridedHistory.KEYS
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, _META_FILE), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.n = meta["n"]
+        self.stride = meta["stride"]
+        # Полностью записанные строки: файлы дописываются по очереди, поэтому
+        # у прерванной записи они могут различаться на один кусок.
+        sizes = [os.path.getsize(os.path.join(path, name)) // row
+                 for name, row in ((_X_FILE, 8 * max(self.n, 1)), (_F_FILE, 8), (_K_FILE, 8))]
+        self.size = min(sizes)
+        # До закрытия записи total в meta.json ещё не известен.
+        self.total = max(meta["total"], int(self["k"][-1]) + 1 if self.size else 0)
+
+    def _memmap(self, name: str, dtype: str, shape: tuple) -> np.ndarray:
+        if self.size == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=shape)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        if key == "x":
+            return self._memmap(_X_FILE, "<f8", (self.size, self.n))
+        if key == "f":
+            return self._memmap(_F_FILE, "<f8", (self.size,))
+        if key == "k":
+            return self._memmap(_K_FILE, "<i8", (self.size,))
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def keys(self):
+        return self.KEYS
+
+    def __repr__(self) -> str:
+        return f"TrajectoryReader(path={self.path!r}, n={self.n}, size={self.size}, total={self.total})"
+
+
+class TrajectoryWriter(_StridedHistory):
+    """
+    Потоковая запись траектории на диск с ограниченным расходом памяти.
+
+    Точки копируются в буфер из chunk_size строк, который при заполнении
+    дописывается в файлы каталога path; в памяти одновременно находится не
+    более chunk_size точек. meta.json пишется при создании и при close(); число
+    точек читатель определяет по размеру файлов, поэтому траекторию
+    прерванного запуска тоже можно прочитать.
+
+    Индексация history['x'] / ['f'] / ['k'] сбрасывает буфер и возвращает
+    np.memmap (см. TrajectoryReader); до close() последняя точка, пропущенная
+    из-за stride, добавляется к копии данных.
+
+    Атрибуты:
+        path: каталог траектории (создаётся; существующие файлы перезаписываются).
+        stride: шаг записи, как у TrajectoryBuffer.
+        chunk_size: число точек в буфере между сбросами на диск (по умолчанию —
+            сколько помещается в CHUNK_BYTES, но не более 256).
+    """
+
+    CHUNK_BYTES = 8 << 20
+
+    def __init__(self, path: str, n: int, stride: int = 1, chunk_size: Optional[int] = None) -> None:
+        super().__init__(stride)
+        self.path = path
+        self.n = n
+        if chunk_size is None:
+            chunk_size = min(256, self.CHUNK_BYTES // (8 * max(n, 1)))
+        self.chunk_size = max(1, chunk_size)
+        self._size = 0
+        self._last_k = -1
+        self._pending = 0
+        self._x = np.empty((self.chunk_size, n), dtype="<f8")
+        self._f = np.empty(self.chunk_size, dtype="<f8")
+        self._k = np.empty(self.chunk_size, dtype="<i8")
+
+        os.makedirs(path, exist_ok=True)
+        self._files = [open(os.path.join(path, name), "wb") for name in (_X_FILE, _F_FILE, _K_FILE)]
+        self._write_meta()
+
+    def _record(self, x: np.ndarray, f: float, k: int) -> None:
+        if self._files is None:
+            raise ValueError("Cannot append to a closed TrajectoryWriter")
+        self._x[self._pending] = x
+        self._f[self._pending] = f
+        self._k[self._pending] = k
+        self._pending += 1
+        self._last_k = k
+        if self._pending == self.chunk_size:
+            self.flush()
+
+    def _last_recorded(self) -> int:
+        return self._last_k
+
+    def _write_meta(self) -> None:
+        meta = {"n": self.n, "size": self._size, "total": self.total, "stride": self.stride}
+        with open(os.path.join(self.path, _META_FILE), "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+
+    def flush(self) -> None:
+        """Дописывает буфер в файлы."""
+        if self._files is None:
+            return
+        m = self._pending
+        for file, data in zip(self._files, (self._x, self._f, self._k)):
+            file.write(data[:m].tobytes())
+            file.flush()
+        self._size += m
+        self._pending = 0
+
+    def close(self) -> "TrajectoryWriter":
+        """Дописывает последнюю точку, сбрасывает буфер, закрывает файлы и обновляет meta.json."""
+        if self._files is None:
+            return self
+        try:
+            super().close()
+            self.flush()
+        finally:
+            for file in self._files:
+                file.close()
+            self._files = None
+        self._write_meta()
+        return self
+
+    def reader(self) -> TrajectoryReader:
+        self.flush()
+        return TrajectoryReader(self.path)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._with_unrecorded_last(key, self.reader()[key])
+
+    @property
+    def size(self) -> int:
+        return self._size + self._pending + self._has_unrecorded_last()
+
+    def __repr__(self) -> str:
+        return f"TrajectoryWriter(path={self.path!r}, n={self.n}, size={self.size}, total={self.total})"
+
+
+def load_trajectory(path: str) -> TrajectoryReader:
+    """Открывает траекторию, записанную TrajectoryWriter, для ленивого чтения."""
+    return TrajectoryReader(path)
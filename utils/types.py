@@ -1,11 +1,25 @@
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Tuple, Union
 
 import numpy as np
 
-HistoryDict = Dict[str, List]
+from utils.trajectory import TrajectoryBuffer, TrajectoryWriter, TrajectoryReader
+
+# Оптимизаторы возвращают TrajectoryBuffer (или TrajectoryWriter при записи на
+# диск); словарь списков поддерживается для совместимости. Все варианты
+# индексируются ключами 'x' и 'f'.
+HistoryDict = Union[TrajectoryBuffer, TrajectoryWriter, TrajectoryReader, Dict[str, List]]
 
 ScalarFunction = Callable[[np.ndarray], float]
 GradientFunction = Callable[[np.ndarray], np.ndarray]
 HessianFunction = Callable[[np.ndarray], np.ndarray]
+# Произведение гессиана на вектор: (x, v) -> ∇²f(x)·v
+HessianVectorProduct = Callable[[np.ndarray, np.ndarray], np.ndarray]
+# Совмещённое вычисление: x -> (f(x), ∇f(x))
+ValueAndGradFunction = Callable[[np.ndarray], Tuple[float, np.ndarray]]
+
+# Пакетные варианты: (m, n) -> (m,), (m, n) -> (m, n), (m, n) -> (m, n, n)
+BatchScalarFunction = Callable[[np.ndarray], np.ndarray]
+BatchGradientFunction = Callable[[np.ndarray], np.ndarray]
+BatchHessianFunction = Callable[[np.ndarray], np.ndarray]
 
 InitialPoint = np.ndarray
\ No newline at end of file
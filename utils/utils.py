@@ -1,31 +1,147 @@
-from typing import Callable
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import numpy as np
 
+from utils.batch import is_vectorized
+from utils.finite_differences import approx_gradient, approx_hessian
 from utils.types import ScalarFunction
 
 
+class EvaluationCache:
+    """
+    Общий LRU-кэш вычислений функции, градиента и гессиана.
+
+    Ключ — вид величины ('f', 'grad', 'hess', ...) и точные байты точки, поэтому
+    повторный запрос в той же точке возвращает сохранённое значение без
+    вычисления. Сохранённые массивы доступны только для чтения.
+
+    Размер кэша ограничен и числом значений, и их суммарным объёмом: плотный
+    гессиан при n = 1000 занимает 8 МБ, поэтому ограничение только по числу
+    записей не защищает от роста памяти. Значение больше max_bytes не
+    сохраняется.
+
+    Атрибуты:
+        maxsize: максимальное число хранимых значений (всех видов вместе).
+        max_bytes: максимальный суммарный объём точек и значений в байтах.
+        nbytes: текущий объём кэша в байтах.
+        hits / misses: число попаданий и промахов по видам.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 64 * 2**20):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._store: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        """Объём значения в байтах: массивы, разреженные матрицы и кортежи из них."""
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, tuple):
+            return sum(EvaluationCache._size(item) for item in value)
+        parts = [getattr(value, name, None) for name in ("data", "indices", "indptr", "row", "col")]
+        if any(isinstance(part, np.ndarray) for part in parts):
+            return sum(part.nbytes for part in parts if isinstance(part, np.ndarray))
+        return sys.getsizeof(value)
+
+    @staticmethod
+    def key(kind: str, x: np.ndarray) -> Tuple:
+        x = np.ascontiguousarray(x, dtype=np.result_type(x, float))
+        return kind, x.dtype.str, x.shape, x.tobytes()
+
+    def get(self, kind: str, x: np.ndarray) -> Tuple[bool, Any]:
+        key = self.key(kind, x)
+        if key in self._store:
+            self._store.move_to_end(key)
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+            return True, self._store[key][0]
+        self.misses[kind] = self.misses.get(kind, 0) + 1
+        return False, None
+
+    def __contains__(self, item: Tuple[str, np.ndarray]) -> bool:
+        kind, x = item
+        return self.key(kind, x) in self._store
+
+    def put(self, kind: str, x: np.ndarray, value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+        key = self.key(kind, x)
+        size = len(key[3]) + self._size(value)
+        if key in self._store:
+            self.nbytes -= self._store.pop(key)[1]
+        if size > self.max_bytes:
+            return value
+        self._store[key] = (value, size)
+        self.nbytes += size
+        while len(self._store) > self.maxsize or self.nbytes > self.max_bytes:
+            self.nbytes -= self._store.popitem(last=False)[1][1]
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        kinds = set(self.hits) | set(self.misses)
+        return {kind: {"hits": self.hits.get(kind, 0), "misses": self.misses.get(kind, 0)} for kind in kinds}
+
+
 class FunctionCounter:
-    def __init__(self, func):
+    """
+    Обёртка, считающая вызовы функции.
+
+    count — число запросов, unique_count — число реальных вычислений. Если
+    передан EvaluationCache, повторные запросы в той же точке берутся из кэша
+    и увеличивают только count.
+    """
+
+    def __init__(self, func, cache: Optional[EvaluationCache] = None, kind: str = "f"):
         self.func = func
         self.count = 0
+        self.unique_count = 0
+        self.cache = cache
+        self.kind = kind
+        self.vectorized = is_vectorized(func)
+
+    def __call__(self, x, *args, **kwargs):
+        # Пакет точек формы (m, n) учитывается как m вычислений и не кэшируется.
+        if np.ndim(x) > 1:
+            self.count += len(x)
+            self.unique_count += len(x)
+            return self.func(x, *args, **kwargs)
 
-    def __call__(self, *args, **kwargs):
         self.count += 1
-        return self.func(*args, **kwargs)
+        if self.cache is None or args or kwargs:
+            self.unique_count += 1
+            return self.func(x, *args, **kwargs)
+
+        found, value = self.cache.get(self.kind, x)
+        if found:
+            return value
+        self.unique_count += 1
+        return self.cache.put(self.kind, x, self.func(x))
 
     def get_count(self):
         return self.count
 
+    def get_unique_count(self):
+        return self.unique_count
+
 
 def sanitize_filename(filename: str) -> str:
     return filename.replace('{', '_').replace('}', '_').replace(',', '_').replace(' ', '_').replace("'", "_").replace(":", "_")
 
 def numerical_gradient(f: ScalarFunction,
                        x: np.ndarray,
-                       eps: float = 1e-9) -> np.ndarray:
+                       eps: Optional[float] = None,
+                       method: str = "central") -> np.ndarray:
     """
-    Вычисляет численный градиент функции f в точке x с помощью центральных разностей.
+    Вычисляет численный градиент функции f в точке x с помощью конечных разностей.
+
+    Все возмущённые точки вычисляются одним пакетным вызовом, если f векторизована
+    (см. utils.finite_differences.approx_gradient).
 
     Для автоматизированного вычисления производных можно использовать библиотеки
     автоматического дифференцирования (например, JAX или autograd).
@@ -33,62 +149,38 @@ def numerical_gradient(f: ScalarFunction,
     Args:
         f: Функция f: ℝⁿ → ℝ.
         x: Точка, в которой считается градиент.
-        eps: Малое приращение для разностной схемы (по умолчанию 1e-8).
+        eps: Абсолютное приращение; по умолчанию шаг подбирается для каждой координаты.
+        method: Разностная схема ('forward', 'central', 'complex').
 
     Returns:
         Вектор численного градиента (np.ndarray).
     """
-    grad = np.zeros_like(x)
-    for i in range(len(x)):
-        x_forward = np.copy(x)
-        x_backward = np.copy(x)
-        x_forward[i] += eps
-        x_backward[i] -= eps
-        grad[i] = (f(x_forward) - f(x_backward)) / (2 * eps)
-    return grad
+    return approx_gradient(f, x, method=method, abs_step=eps)
 
-def create_numerical_gradient(f: ScalarFunction) -> Callable[[np.ndarray], np.ndarray]:
-    return lambda x: numerical_gradient(f, x)
+def create_numerical_gradient(f: ScalarFunction, method: str = "central") -> Callable[[np.ndarray], np.ndarray]:
+    return lambda x: numerical_gradient(f, x, method=method)
 
 
-def numerical_hessian(f: ScalarFunction, x: np.ndarray, eps: float = 1e-5) -> np.ndarray:
+def numerical_hessian(f: ScalarFunction,
+                      x: np.ndarray,
+                      eps: Optional[float] = None,
+                      method: str = "central") -> np.ndarray:
     """
-    Численно вычисляет гессиан функции f в точке x с помощью центральных разностей.
+    Численно вычисляет гессиан функции f в точке x с помощью конечных разностей.
+
+    Вычисляется только верхний треугольник (n(n+1)/2 элементов), все точки
+    схемы вычисляются пакетно (см. utils.finite_differences.approx_hessian).
 
     Args:
         f: Скалярная функция f: ℝⁿ → ℝ.
         x: Точка, в которой вычисляется гессиан (np.ndarray размерности n).
-        eps: Малое приращение (по умолчанию 1e-5).
+        eps: Абсолютное приращение; по умолчанию шаг подбирается для каждой координаты.
+        method: Разностная схема ('forward', 'central', 'complex').
 
     Returns:
         Гессиан f в точке x (матрица n×n).
     """
-    n = x.size
-    hessian = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            x_ijp = x.copy()
-            x_ijm = x.copy()
-            x_imp = x.copy()
-            x_imm = x.copy()
-
-            x_ijp[i] += eps
-            x_ijp[j] += eps
-
-            x_ijm[i] += eps
-            x_ijm[j] -= eps
-
-            x_imp[i] -= eps
-            x_imp[j] += eps
-
-            x_imm[i] -= eps
-            x_imm[j] -= eps
-
-            hessian[i, j] = (
-                f(x_ijp) - f(x_ijm) - f(x_imp) + f(x_imm)
-            ) / (4 * eps ** 2)
-
-    return (hessian + hessian.T) / 2
+    return approx_hessian(f, x, method=method, abs_step=eps)
 
-def create_numerical_hessian(f: ScalarFunction) -> Callable[[np.ndarray], np.ndarray]:
-    return lambda x: numerical_hessian(f, x)
\ No newline at end of file
+def create_numerical_hessian(f: ScalarFunction, method: str = "central") -> Callable[[np.ndarray], np.ndarray]:
+    return lambda x: numerical_hessian(f, x, method=method)
\ No newline at end of file
@@ -1,19 +1,54 @@
+from collections import OrderedDict
+
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Optional, Dict, List, Any, Callable
+from typing import Optional, Tuple
+
+from utils.batch import supports_broadcasting
+from utils.types import HistoryDict, ScalarFunction
+from visualizations.surface_cache import surface_cache_key, load_surface, save_surface
 
-# Типовые алиасы для удобства
-HistoryDict = Dict[str, List[Any]]
-ScalarFunction = Callable[[np.ndarray], float]
+# Кэш вычисленных сеток: ключ — (функция, границы, число точек). Графики одного
+# запуска и повторные запуски на той же функции используют одну сетку.
+# Между процессами и запусками сетки разделяются через дисковый кэш
+# (visualizations.surface_cache), если не передан disk_cache=False.
+_SURFACE_CACHE: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+SURFACE_CACHE_SIZE = 16
+GRID_CHUNK_SIZE = 1 << 16
 
 
 # ==============================
 # Вспомогательные функции
 # ==============================
+def evaluate_points(f: ScalarFunction, points: np.ndarray, chunk_size: int = GRID_CHUNK_SIZE) -> np.ndarray:
+    """
+    Вычисляет f во всех точках массива (m, 2).
+
+    Если f поддерживает пакетный вход, она вызывается на кусках до chunk_size
+    точек, иначе — поточечно.
+    """
+    points = np.asarray(points, dtype=float)
+    if supports_broadcasting(f, points.shape[1]):
+        return np.concatenate([np.asarray(f(points[i:i + chunk_size]), dtype=float).reshape(-1)
+                               for i in range(0, len(points), chunk_size)])
+    return np.fromiter((f(p) for p in points), dtype=float, count=len(points))
+
+
+def evaluate_on_grid(f: ScalarFunction, X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """Вычисляет Z = f([X, Y]) на сетке одним пакетным вызовом (см. evaluate_points)."""
+    points = np.column_stack([X.ravel(), Y.ravel()])
+    return evaluate_points(f, points).reshape(X.shape)
+
+
+def clear_surface_cache() -> None:
+    _SURFACE_CACHE.clear()
+
+
 def compute_meshgrid_data(f: ScalarFunction,
                           x_min: float, x_max: float,
                           y_min: float, y_max: float,
-                          num_points: int = 300) -> (np.ndarray, np.ndarray, np.ndarray):
+                          num_points: int = 300,
+                          disk_cache: bool = True) -> (np.ndarray, np.ndarray, np.ndarray):
     """
     Вычисляет сетку (X, Y) и соответствующие значения Z = f([x, y]) на этой сетке.
 
@@ -24,14 +59,38 @@ def compute_meshgrid_data(f: ScalarFunction,
         y_min: Минимальное значение по оси Y.
         y_max: Максимальное значение по оси Y.
         num_points: Число точек по каждой оси (по умолчанию 300).
+        disk_cache: Использовать ли дисковый кэш сеток (report/_surface_cache).
 
     Returns:
         Кортеж (X, Y, Z), где X и Y — массивы сетки, а Z — двумерный массив значений f.
+        Массивы берутся из кэша и доступны только для чтения.
     """
+    key = (f, float(x_min), float(x_max), float(y_min), float(y_max), int(num_points))
+    try:
+        cached = _SURFACE_CACHE.get(key)
+    except TypeError:  # нехешируемая функция — без кэша
+        key, cached = None, None
+    if cached is not None:
+        _SURFACE_CACHE.move_to_end(key)
+        return cached
+
     x_vals = np.linspace(x_min, x_max, num_points)
     y_vals = np.linspace(y_min, y_max, num_points)
     X, Y = np.meshgrid(x_vals, y_vals)
-    Z = np.array([[f(np.array([x, y])) for x in x_vals] for y in y_vals])
+
+    disk_key = surface_cache_key(f, x_min, x_max, y_min, y_max, num_points) if disk_cache else None
+    Z = load_surface(disk_key) if disk_key is not None else None
+    if Z is None or Z.shape != X.shape:
+        Z = evaluate_on_grid(f, X, Y)
+        if disk_key is not None:
+            save_surface(disk_key, Z)
+    for array in (X, Y, Z):
+        array.flags.writeable = False
+
+    if key is not None:
+        _SURFACE_CACHE[key] = (X, Y, Z)
+        while len(_SURFACE_CACHE) > SURFACE_CACHE_SIZE:
+            _SURFACE_CACHE.popitem(last=False)
     return X, Y, Z
 
 
@@ -87,7 +146,7 @@ def plot_contour_and_trajectory(history: HistoryDict,
         title: Заголовок графика.
         save_path: Путь для сохранения графика, или None.
     """
-    x_hist = np.array(history['x'])
+    x_hist = np.asarray(history['x'])
     if x_hist.shape[1] != 2:
         print("⚠️ Trajectory visualization is supported only for 2D functions.")
         return
@@ -131,7 +190,7 @@ def plot_full_history(history: HistoryDict,
     axes[0].grid(True)
 
     # Контур с траекторией
-    x_hist = np.array(history['x'])
+    x_hist = np.asarray(history['x'])
     if f is not None and x_hist.shape[1] == 2:
         x_min, x_max = x_hist[:, 0].min() - 1, x_hist[:, 0].max() + 1
         y_min, y_max = x_hist[:, 1].min() - 1, x_hist[:, 1].max() + 1
@@ -213,16 +272,13 @@ def plot_surface_and_trajectory_with_path(f: ScalarFunction,
         save_path: Путь для сохранения графика, или None.
         lim: Ограничение для осей X и Y.
     """
-    x_hist_full = np.array(history['x'])
-    z_hist_full = np.array([f(x) for x in x_hist_full])
+    x_hist_full = np.asarray(history['x'])
+    z_hist_full = evaluate_points(f, x_hist_full)
     actual_len = len(history['f'])
     x_hist = x_hist_full[:actual_len]
     z_hist = z_hist_full[:actual_len]
 
-    X_vals = np.linspace(-lim, lim, 200)
-    Y_vals = np.linspace(-lim, lim, 200)
-    X, Y = np.meshgrid(X_vals, Y_vals)
-    Z = np.array([[f(np.array([x, y])) for x in X_vals] for y in Y_vals])
+    X, Y, Z = compute_meshgrid_data(f, -lim, lim, -lim, lim, num_points=200)
 
     fig = plt.figure(figsize=(11, 8))
     ax = fig.add_subplot(111, projection='3d')
@@ -264,11 +320,8 @@ def plot_surface_and_trajectory(f: ScalarFunction,
         save_path: Путь для сохранения графика, или None.
         lim: Ограничение для осей X и Y в контурном графике.
     """
-    x_hist = np.array(history['x'])
-    X_vals = np.linspace(-lim, lim, 200)
-    Y_vals = np.linspace(-lim, lim, 200)
-    X, Y = np.meshgrid(X_vals, Y_vals)
-    Z = np.array([[f(np.array([x, y])) for x in X_vals] for y in Y_vals])
+    x_hist = np.asarray(history['x'])
+    X, Y, Z = compute_meshgrid_data(f, -lim, lim, -lim, lim, num_points=200)
 
     fig = plt.figure(figsize=(14, 6))
 
@@ -0,0 +1,320 @@
+import importlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+
+from utils.types import HistoryDict, ScalarFunction
+from visualizations.plotting import compute_meshgrid_data, evaluate_points
+
+# Пакетная отрисовка графиков single_test без pyplot (холст Agg, работает без
+# дисплея). Фигуры с поверхностью строятся один раз на (график, функция, lim)
+# и переиспользуются: между запусками обновляются только артисты траектории.
+# Для растровых форматов статический фон (поверхность, контур) растеризуется
+# один раз, а траектория дорисовывается поверх него (blitting).
+# Растеризация выполняется в вызывающем потоке, а PNG-кодирование и запись
+# файла — в пуле потоков. Векторные форматы (svg, pdf) сохраняются сразу.
+#
+# Режимы:
+#     'immediate' — графики строятся при вызове render;
+#     'deferred'  — render сохраняет только данные (.npz + .json), графики
+#                   строятся позже через render_deferred / render_all_deferred.
+
+RENDER_MODES = ("immediate", "deferred")
+RASTER_FORMATS = ("png",)
+_DEFERRED_SUFFIX = ".render.npz"
+
+
+class BatchRenderer:
+    """
+    Отрисовка трёх графиков single_test (история, поверхность с контуром,
+    3D-траектория) с переиспользованием фигур и фоновым сохранением.
+
+    Атрибуты:
+        dpi: разрешение растровых изображений.
+        fmt: формат файлов ('png', 'svg', 'pdf', ...).
+        mode: 'immediate' или 'deferred'.
+        workers: число потоков для кодирования и записи файлов.
+        max_templates: сколько фигур-шаблонов хранить одновременно.
+        max_pending: сколько изображений может ожидать записи; каждое держит
+            в памяти копию RGBA-буфера, поэтому при превышении render ждёт
+            завершения самых старых.
+    """
+
+    def __init__(self, dpi: int = 150, fmt: str = "png", mode: str = "immediate",
+                 workers: int = 4, max_templates: int = 8, max_pending: int = 32) -> None:
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {mode}. Expected one of {RENDER_MODES}")
+        self.dpi = dpi
+        self.fmt = fmt.lstrip(".")
+        self.mode = mode
+        self.max_templates = max_templates
+        self.max_pending = max(1, max_pending)
+        self._templates: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending: List[Future] = []
+
+    # ==== Общий интерфейс ====
+
+    def render(self, f: ScalarFunction, history: HistoryDict, title: str, save_path: Optional[str] = None,
+               lim: float = 4, stem: Optional[str] = None) -> None:
+        """
+        Строит (или откладывает) три графика запуска. Имена файлов образуются
+        из save_path так же, как в single_test.draw: <base>.<fmt>,
+        <base>_dual.<fmt>, <base>_3dtraj.<fmt>, где base — save_path без
+        расширения. Если задан stem, он используется как base без изменений:
+        имена отчётов содержат точки (например, lr_0.1), и повторное отсечение
+        «расширения» у пути без него испортило бы имя.
+        """
+        if stem is None and save_path is None:
+            raise ValueError("Either save_path or stem must be given")
+        base = stem if stem is not None else os.path.splitext(save_path)[0]
+        x_hist = np.array(history['x'], dtype=float)
+        f_hist = np.array(history['f'], dtype=float)
+        if self.mode == "deferred":
+            self._save_data(base, f, x_hist, f_hist, title, lim)
+            return
+        self.render_full_history(f, x_hist, f_hist, title, f"{base}.{self.fmt}")
+        if x_hist.ndim == 2 and x_hist.shape[1] == 2:
+            self.render_surface_and_trajectory(f, x_hist, f"{base}_dual.{self.fmt}", lim)
+            self.render_surface_and_trajectory_with_path(f, x_hist, title + " — 3D Trajectory",
+                                                         f"{base}_3dtraj.{self.fmt}", lim)
+
+    def wait(self) -> None:
+        """Дожидается записи всех файлов; ошибки фоновой записи пробрасываются."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        self.wait()
+        self._pool.shutdown()
+        self._templates.clear()
+
+    def __enter__(self) -> "BatchRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ==== Шаблоны и сохранение ====
+
+    def _template(self, key: tuple, build: Callable[[], Dict]) -> Dict:
+        try:
+            template = self._templates.get(key)
+        except TypeError:  # нехешируемая функция — шаблон не кэшируется
+            return build()
+        if template is None:
+            template = build()
+            self._templates[key] = template
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        else:
+            self._templates.move_to_end(key)
+        return template
+
+    @property
+    def _blit(self) -> bool:
+        return self.fmt in RASTER_FORMATS
+
+    def _dynamic(self, *artists) -> List:
+        """Помечает артисты, которые меняются между запусками (рисуются поверх фона)."""
+        for artist in artists:
+            artist.set_animated(self._blit)
+        return list(artists)
+
+    def _save(self, fig: Figure, path: str, template: Optional[Dict] = None) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if self.fmt not in RASTER_FORMATS:
+            fig.savefig(path, dpi=self.dpi, format=self.fmt)
+            return
+        canvas = fig.canvas
+        if template is None or template.get("background") is None:
+            fig.set_dpi(self.dpi)
+            canvas.draw()
+            if template is not None:
+                template["background"] = canvas.copy_from_bbox(fig.bbox)
+        else:
+            canvas.restore_region(template["background"])
+        for artist in (template or {}).get("dynamic", ()):
+            fig.draw_artist(artist)
+        rgba = np.asarray(canvas.buffer_rgba()).copy()
+        self._reap()
+        self._pending.append(self._pool.submit(imsave, path, rgba, format=self.fmt, dpi=self.dpi))
+
+    def _reap(self) -> None:
+        """
+        Убирает завершённые задания записи, пробрасывая их ошибки, и ждёт
+        самые старые, пока ожидающих не станет меньше max_pending.
+        """
+        pending, done = [], []
+        for future in self._pending:
+            (done if future.done() else pending).append(future)
+        self._pending = pending
+        for future in done:
+            future.result()
+        while len(self._pending) >= self.max_pending:
+            self._pending.pop(0).result()
+
+    # ==== Графики ====
+
+    def render_full_history(self, f: Optional[ScalarFunction], x_hist: np.ndarray, f_hist: np.ndarray,
+                            title: str, save_path: str) -> None:
+        """Аналог plotting.plot_full_history: сходимость и контур с траекторией."""
+        def build():
+            fig = Figure(figsize=(12, 5))
+            FigureCanvasAgg(fig)
+            axes = fig.subplots(1, 2)
+            convergence, = axes[0].plot([], [], marker='o')
+            axes[0].set_xlabel("Iteration")
+            axes[0].set_ylabel("f(x)")
+            axes[0].grid(True)
+            return {"fig": fig, "axes": axes, "convergence": convergence}
+
+        t = self._template(("full_history",), build)
+        fig, axes = t["fig"], t["axes"]
+        t["convergence"].set_data(np.arange(len(f_hist)), f_hist)
+        axes[0].relim()
+        axes[0].autoscale_view()
+        axes[0].set_title(title + " — Convergence")
+
+        # Границы контура зависят от траектории, поэтому правая ось перестраивается.
+        axes[1].clear()
+        if f is not None and x_hist.ndim == 2 and x_hist.shape[1] == 2:
+            x_min, x_max = x_hist[:, 0].min() - 1, x_hist[:, 0].max() + 1
+            y_min, y_max = x_hist[:, 1].min() - 1, x_hist[:, 1].max() + 1
+            X, Y, Z = compute_meshgrid_data(f, x_min, x_max, y_min, y_max)
+            contour = axes[1].contour(X, Y, Z, levels=50, cmap='viridis')
+            axes[1].clabel(contour, inline=True, fontsize=8)
+            axes[1].plot(x_hist[:, 0], x_hist[:, 1], 'r.-', label="Trajectory")
+            axes[1].set_xlabel("x")
+            axes[1].set_ylabel("y")
+            axes[1].set_title(title + " — Trajectory")
+            axes[1].legend()
+            axes[1].grid(True)
+        else:
+            axes[1].text(0.5, 0.5, "2D trajectory not available",
+                         horizontalalignment='center', verticalalignment='center')
+        fig.tight_layout()
+        self._save(fig, save_path)
+
+    def render_surface_and_trajectory(self, f: ScalarFunction, x_hist: np.ndarray, save_path: str,
+                                      lim: float = 4) -> None:
+        """Аналог plotting.plot_surface_and_trajectory: 3D-поверхность и контур с траекторией."""
+        def build():
+            X, Y, Z = compute_meshgrid_data(f, -lim, lim, -lim, lim, num_points=200)
+            fig = Figure(figsize=(14, 6))
+            FigureCanvasAgg(fig)
+            ax1 = fig.add_subplot(1, 2, 1, projection='3d')
+            ax1.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8)
+            ax1.set_title("3D View")
+            ax1.set_xlabel("X")
+            ax1.set_ylabel("Y")
+            ax1.set_zlabel("f(X,Y)")
+            ax1.set_xlim(-lim, lim)
+            ax1.set_ylim(-lim, lim)
+
+            ax2 = fig.add_subplot(1, 2, 2)
+            contour = ax2.contourf(X, Y, Z, levels=50, cmap='viridis')
+            fig.colorbar(contour, ax=ax2)
+            ax2.set_title("Contour Plot with Trajectory")
+            ax2.set_xlabel("X")
+            ax2.set_ylabel("Y")
+            ax2.set_xlim(-lim, lim)
+            ax2.set_ylim(-lim, lim)
+            trajectory, = ax2.plot([], [], 'r.-', label="Trajectory")
+            optimum, = ax2.plot([], [], 'ko', label="x*")
+            legend = ax2.legend()
+            fig.tight_layout()
+            return {"fig": fig, "trajectory": trajectory, "optimum": optimum,
+                    "dynamic": self._dynamic(trajectory, optimum, legend)}
+
+        t = self._template(("surface", f, float(lim)), build)
+        t["trajectory"].set_data(x_hist[:, 0], x_hist[:, 1])
+        t["optimum"].set_data(x_hist[-1:, 0], x_hist[-1:, 1])
+        self._save(t["fig"], save_path, t)
+
+    def render_surface_and_trajectory_with_path(self, f: ScalarFunction, x_hist: np.ndarray, title: str,
+                                                save_path: str, lim: float = 4) -> None:
+        """Аналог plotting.plot_surface_and_trajectory_with_path: 3D-поверхность с траекторией."""
+        def build():
+            X, Y, Z = compute_meshgrid_data(f, -lim, lim, -lim, lim, num_points=200)
+            fig = Figure(figsize=(11, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(111, projection='3d')
+            trajectory, = ax.plot([], [], [], 'r-', linewidth=2, marker='o', markersize=4, label="Trajectory",
+                                  zorder=10)
+            optimum, = ax.plot([], [], [], 'o', color='black', markersize=8, label="x*", zorder=11)
+            ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.6, antialiased=True, zorder=1)
+            ax.set_xlim(-lim, lim)
+            ax.set_ylim(-lim, lim)
+            ax.set_zlim(Z.min(), min(Z.max(), 100))
+            ax.view_init(elev=35, azim=135)
+            ax.set_xlabel("x")
+            ax.set_ylabel("y")
+            ax.set_zlabel("f(x, y)")
+            legend = ax.legend()
+            fig.tight_layout()
+            return {"fig": fig, "ax": ax, "trajectory": trajectory, "optimum": optimum,
+                    "dynamic": self._dynamic(trajectory, optimum, legend, ax.title)}
+
+        t = self._template(("surface_3d", f, float(lim)), build)
+        z_hist = evaluate_points(f, x_hist)
+        t["trajectory"].set_data_3d(x_hist[:, 0], x_hist[:, 1], z_hist)
+        t["optimum"].set_data_3d(x_hist[-1:, 0], x_hist[-1:, 1], z_hist[-1:])
+        t["ax"].set_title(title)
+        self._save(t["fig"], save_path, t)
+
+    # ==== Отложенная отрисовка ====
+
+    def _save_data(self, base: str, f: ScalarFunction, x_hist: np.ndarray, f_hist: np.ndarray,
+                   title: str, lim: float) -> None:
+        os.makedirs(os.path.dirname(base) or ".", exist_ok=True)
+        meta = {"title": title, "lim": lim,
+                "function": f"{getattr(f, '__module__', '')}:{getattr(f, '__qualname__', '')}"}
+        np.savez(base + _DEFERRED_SUFFIX, x=x_hist, f=f_hist, meta=json.dumps(meta))
+
+    def render_deferred(self, data_path: str, f: Optional[ScalarFunction] = None) -> None:
+        """
+        Строит графики по данным, сохранённым в режиме 'deferred'.
+
+        Функция восстанавливается по имени модуля и qualname; для функций,
+        которые нельзя импортировать (например, замыканий), её нужно передать в f.
+        """
+        with np.load(data_path) as data:
+            x_hist, f_hist = data["x"], data["f"]
+            meta = json.loads(str(data["meta"]))
+        if f is None:
+            f = resolve_function(meta["function"])
+        base = data_path[:-len(_DEFERRED_SUFFIX)]
+        mode, self.mode = self.mode, "immediate"
+        try:
+            self.render(f, {'x': x_hist, 'f': f_hist}, meta["title"], lim=meta["lim"], stem=base)
+        finally:
+            self.mode = mode
+
+    def render_all_deferred(self, directory: str) -> int:
+        """Строит графики для всех отложенных запусков в каталоге (рекурсивно)."""
+        count = 0
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.endswith(_DEFERRED_SUFFIX):
+                    self.render_deferred(os.path.join(root, name))
+                    count += 1
+        self.wait()
+        return count
+
+
+def resolve_function(name: str) -> ScalarFunction:
+    """Находит функцию по строке 'module:qualname'."""
+    module_name, _, qualname = name.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
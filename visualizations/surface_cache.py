@@ -0,0 +1,127 @@
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from types import CodeType
+from typing import Callable, Optional, Set
+
+import numpy as np
+
+from utils.paths import get_project_root
+
+# Дисковый кэш сеток значений функции для контурных и 3D-графиков.
+# Файл report/_surface_cache/<sha256>.npy содержит матрицу Z; ключ строится по
+# содержимому: модуль, имя и байт-код функции (а также значения замыкания,
+# аргументов по умолчанию и вызываемые функции модуля), границы и разрешение
+# сетки. Изменение кода функции даёт новый ключ, поэтому старые файлы просто
+# перестают использоваться. При повторном использовании файл отображается в
+# память. Недетерминированные функции (deterministic = False) не кэшируются.
+
+
+def get_surface_cache_dir() -> Path:
+    return get_project_root() / "report" / "_surface_cache"
+
+
+def _code_fingerprint(code: CodeType) -> str:
+    """
+    Описание объекта кода: байт-код, константы (вложенные объекты кода —
+    рекурсивно), имена и позиции инструкций. Позиции включают строку и
+    столбец, поэтому две lambda на одной строке различаются.
+    """
+    consts = tuple(_code_fingerprint(c) if inspect.iscode(c) else repr(c) for c in code.co_consts)
+    return repr((code.co_code.hex(), consts, code.co_names, code.co_firstlineno, tuple(code.co_positions())))
+
+
+def _global_names(code: CodeType) -> Set[str]:
+    """Имена, к которым обращается код, включая вложенные функции и генераторы."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def _function_fingerprint(f: Callable, _seen: Optional[Set[int]] = None) -> Optional[bytes]:
+    """
+    Байтовое описание функции для ключа кэша или None, если функцию нельзя
+    надёжно идентифицировать (например, её код недоступен) или она помечена
+    как недетерминированная (атрибут deterministic = False).
+    """
+    if not getattr(f, "deterministic", True):
+        return None
+    seen = _seen if _seen is not None else set()
+    seen.add(id(f))
+
+    parts = [getattr(f, "__module__", None) or "", getattr(f, "__qualname__", None) or type(f).__qualname__]
+    code = getattr(f, "__code__", None)
+    if code is None:
+        try:
+            parts.append(inspect.getsource(f))
+        except (OSError, TypeError):
+            return None
+    else:
+        parts.append(_code_fingerprint(code))
+
+    # Функции-фабрики (например, из functions.nd_funcs) отличаются только
+    # значениями замыкания, поэтому они тоже входят в ключ, как и
+    # вызываемые из кода функции-помощники модуля.
+    captured = [cell.cell_contents for cell in (getattr(f, "__closure__", None) or ())]
+    captured.append(getattr(f, "__defaults__", None))
+    if code is not None:
+        module_globals = getattr(f, "__globals__", {})
+        helpers = (module_globals.get(name) for name in sorted(_global_names(code)))
+        captured.extend(helper for helper in helpers if inspect.isfunction(helper))
+    for value in captured:
+        if callable(value):
+            if id(value) in seen:
+                continue
+            nested = _function_fingerprint(value, seen)
+            if nested is None:
+                return None
+            parts.append(nested.decode("utf-8", "replace"))
+            continue
+        try:
+            parts.append(hashlib.sha256(pickle.dumps(value)).hexdigest())
+        except Exception:
+            return None
+    return "\0".join(parts).encode("utf-8")
+
+
+def surface_cache_key(f: Callable, x_min: float, x_max: float, y_min: float, y_max: float,
+                      num_points: int) -> Optional[str]:
+    fingerprint = _function_fingerprint(f)
+    if fingerprint is None:
+        return None
+    digest = hashlib.sha256(fingerprint)
+    digest.update(np.array([x_min, x_max, y_min, y_max], dtype=float).tobytes())
+    digest.update(str(int(num_points)).encode())
+    return digest.hexdigest()
+
+
+def load_surface(key: str) -> Optional[np.ndarray]:
+    """Загружает сетку Z из кэша (memory-mapped, только чтение) или возвращает None."""
+    path = get_surface_cache_dir() / f"{key}.npy"
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def save_surface(key: str, Z: np.ndarray) -> None:
+    """
+    Сохраняет сетку Z. Запись идёт во временный файл с последующим атомарным
+    переименованием, поэтому параллельные процессы не видят недописанный файл.
+    """
+    cache_dir = get_surface_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            np.save(tmp, np.asarray(Z, dtype=float))
+        os.replace(tmp_path, cache_dir / f"{key}.npy")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise